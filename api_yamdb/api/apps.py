@@ -1,5 +1,18 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished, request_started
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .db import check_connections
+        from .metrics import connection_opened, connections_closed
+
+        request_started.connect(check_connections)
+        # После check_connections и close_old_connections Django.
+        request_started.connect(connections_closed)
+        request_finished.connect(connections_closed)
+        connection_created.connect(connection_opened)
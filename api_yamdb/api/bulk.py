@@ -0,0 +1,290 @@
+"""Массовая запись произведений, жанров и отзывов для синхронизации каталога.
+
+POST создает объекты, PUT создает или обновляет, DELETE удаляет по ключам.
+Тело - JSON массив или NDJSON (application/x-ndjson). Каждый объект
+проверяется отдельно, slug и username переводятся в id одним запросом на
+весь пакет, запись идет через bulk_create и bulk_update в одной транзакции.
+Ответ содержит результат по каждому объекту в порядке запроса.
+"""
+from abc import ABC, abstractmethod
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework.exceptions import ParseError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+from reviews.db_utils import reset_sequences
+from reviews.models import Category, Genre, GenreTitle, Review, Title
+from reviews.ratings import recalculate_ratings
+from users.models import User
+
+from .cache import bump_versions
+from .permissions import IsAdministrator
+from .renderers import FastJSONParser, NDJSONParser
+from .serializers import (GenreBulkSerializer, ReviewBulkSerializer,
+                          TitleBulkSerializer)
+from .views import REVIEW_EXISTS
+
+BATCH_SIZE = 1000
+
+
+def error(index, errors):
+    return {'index': index, 'status': 'error', 'errors': errors}
+
+
+class BulkView(ABC, APIView):
+    """База: разбор пакета, проверка и удаление, запись - в save."""
+    serializer_class = None
+    key = 'id'
+    key_type = int
+    cache_models = ()
+    permission_classes = (IsAdministrator,)
+    parser_classes = (FastJSONParser, NDJSONParser)
+
+    def get_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ParseError('Ожидается JSON массив или NDJSON.')
+        if len(items) > settings.BULK_MAX_ITEMS:
+            raise ParseError(
+                f'Не больше {settings.BULK_MAX_ITEMS} объектов за запрос.')
+        return items
+
+    def validate(self, items):
+        """Проверяет объекты, возвращает ошибки и {индекс: данные}."""
+        results = [None] * len(items)
+        valid = {}
+        for index, item in enumerate(items):
+            serializer = self.serializer_class(data=item)
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                results[index] = error(index, serializer.errors)
+        return results, valid
+
+    def drop_duplicates(self, results, valid, get_key):
+        seen = set()
+        for index, data in list(valid.items()):
+            key = get_key(data)
+            if key is None:
+                continue
+            if key in seen:
+                results[index] = error(index, {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        'Повторяется в запросе.']})
+                del valid[index]
+            seen.add(key)
+
+    def post(self, request):
+        return self.write(request, upsert=False)
+
+    def put(self, request):
+        return self.write(request, upsert=True)
+
+    def write(self, request, upsert):
+        results, valid = self.validate(self.get_items(request))
+        with transaction.atomic():
+            self.save(results, valid, upsert)
+        bump_versions(*self.cache_models)
+        return Response({'results': results})
+
+    def is_key(self, key):
+        return isinstance(key, self.key_type) and not isinstance(key, bool)
+
+    def delete(self, request):
+        keys = [
+            item.get(self.key) if isinstance(item, dict) else item
+            for item in self.get_items(request)
+        ]
+        model = self.serializer_class.Meta.model
+        with transaction.atomic():
+            queryset = model.objects.filter(**{f'{self.key}__in': [
+                key for key in keys if self.is_key(key)]})
+            existing = set(queryset.values_list(self.key, flat=True))
+            queryset.delete()
+        bump_versions(*self.cache_models)
+        return Response({'results': [
+            {'index': index, self.key: key,
+             'status': ('deleted' if self.is_key(key) and key in existing
+                        else 'not_found')}
+            for index, key in enumerate(keys)
+        ]})
+
+    @abstractmethod
+    def save(self, results, valid, upsert):
+        """Пишет valid в базу и заполняет results по индексам."""
+
+
+class TitleBulkView(BulkView):
+    """Произведения, ключ - id. Жанры заменяются целиком."""
+    serializer_class = TitleBulkSerializer
+    cache_models = (Title, GenreTitle)
+
+    def save(self, results, valid, upsert):
+        self.drop_duplicates(results, valid, lambda data: data.get('id'))
+        categories = dict(Category.objects.filter(
+            slug__in={data['category'] for data in valid.values()}
+        ).values_list('slug', 'id'))
+        genres = dict(Genre.objects.filter(
+            slug__in={slug for data in valid.values()
+                      for slug in data['genre']}
+        ).values_list('slug', 'id'))
+        existing = set(Title.objects.filter(
+            id__in=[data['id'] for data in valid.values() if 'id' in data]
+        ).values_list('id', flat=True))
+        created, updated = [], []
+        for index, data in valid.items():
+            errors = {}
+            if data['category'] not in categories:
+                errors['category'] = [f'Категория {data["category"]} '
+                                      'не найдена.']
+            missing = [slug for slug in data['genre'] if slug not in genres]
+            if missing:
+                errors['genre'] = [f'Жанр {slug} не найден.'
+                                   for slug in missing]
+            if data.get('id') in existing and not upsert:
+                errors['id'] = ['Произведение уже существует.']
+            if errors:
+                results[index] = error(index, errors)
+                continue
+            title = Title(
+                id=data.get('id'), name=data['name'], year=data['year'],
+                description=data.get('description', ''),
+                category_id=categories[data['category']],
+            )
+            if title.id in existing:
+                updated.append((index, title))
+            else:
+                created.append((index, title))
+        self.create(created)
+        Title.objects.bulk_update(
+            [title for _, title in updated],
+            ('name', 'year', 'description', 'category'),
+            batch_size=BATCH_SIZE)
+        GenreTitle.objects.filter(
+            title_id__in=[title.id for _, title in updated]).delete()
+        GenreTitle.objects.bulk_create([
+            GenreTitle(title_id=title.id, genre_id=genres[slug])
+            for index, title in created + updated
+            for slug in dict.fromkeys(valid[index]['genre'])
+        ], batch_size=BATCH_SIZE)
+        for status, titles in (('created', created), ('updated', updated)):
+            for index, title in titles:
+                results[index] = {
+                    'index': index, 'status': status, 'id': title.id}
+
+    def create(self, created):
+        titles = [title for _, title in created]
+        with_id = [title for title in titles if title.id is not None]
+        without_id = [title for title in titles if title.id is None]
+        Title.objects.bulk_create(with_id, batch_size=BATCH_SIZE)
+        if with_id:
+            reset_sequences([Title])
+        if connection.features.can_return_ids_from_bulk_insert:
+            Title.objects.bulk_create(without_id, batch_size=BATCH_SIZE)
+        else:
+            # Без RETURNING id новых строк не узнать, нужные для жанров.
+            for title in without_id:
+                title.save()
+
+
+class GenreBulkView(BulkView):
+    """Жанры, ключ - slug."""
+    serializer_class = GenreBulkSerializer
+    key = 'slug'
+    key_type = str
+    cache_models = (Genre,)
+
+    def save(self, results, valid, upsert):
+        self.drop_duplicates(results, valid, lambda data: data['slug'])
+        existing = Genre.objects.in_bulk(
+            [data['slug'] for data in valid.values()], field_name='slug')
+        created, updated = [], []
+        for index, data in valid.items():
+            genre = existing.get(data['slug'])
+            if genre is None:
+                created.append((index, Genre(**data)))
+            elif upsert:
+                genre.name = data['name']
+                updated.append((index, genre))
+            else:
+                results[index] = error(
+                    index, {'slug': ['Жанр уже существует.']})
+        Genre.objects.bulk_create(
+            [genre for _, genre in created], batch_size=BATCH_SIZE)
+        Genre.objects.bulk_update(
+            [genre for _, genre in updated], ('name',),
+            batch_size=BATCH_SIZE)
+        for status, genres in (('created', created), ('updated', updated)):
+            for index, genre in genres:
+                results[index] = {
+                    'index': index, 'status': status, 'slug': genre.slug}
+
+
+class ReviewBulkView(BulkView):
+    """Отзывы, ключ - пара (title, author). Рейтинг пересчитывается."""
+    serializer_class = ReviewBulkSerializer
+    cache_models = (Review, Title)
+
+    def save(self, results, valid, upsert):
+        self.drop_duplicates(
+            results, valid, lambda data: (data['title'], data['author']))
+        title_ids = {data['title'] for data in valid.values()}
+        titles = set(Title.objects.filter(
+            id__in=title_ids).values_list('id', flat=True))
+        authors = dict(User.objects.filter(
+            username__in={data['author'] for data in valid.values()}
+        ).values_list('username', 'id'))
+        existing = {
+            (review.title_id, review.author_id): review
+            for review in Review.objects.filter(
+                title_id__in=titles, author_id__in=authors.values())
+        }
+        created, updated = [], []
+        for index, data in valid.items():
+            errors = {}
+            if data['title'] not in titles:
+                errors['title'] = ['Произведение не найдено.']
+            if data['author'] not in authors:
+                errors['author'] = ['Пользователь не найден.']
+            review = existing.get(
+                (data['title'], authors.get(data['author'])))
+            if review is not None and not upsert:
+                errors[api_settings.NON_FIELD_ERRORS_KEY] = [REVIEW_EXISTS]
+            if errors:
+                results[index] = error(index, errors)
+            elif review is None:
+                created.append((index, Review(
+                    title_id=data['title'], author_id=authors[data['author']],
+                    text=data['text'], score=data['score'])))
+            else:
+                review.text = data['text']
+                review.score = data['score']
+                updated.append((index, review))
+        Review.objects.bulk_create(
+            [review for _, review in created], batch_size=BATCH_SIZE)
+        Review.objects.bulk_update(
+            [review for _, review in updated], ('text', 'score'),
+            batch_size=BATCH_SIZE)
+        self.fill_ids([review for _, review in created])
+        recalculate_ratings(Title.objects.filter(id__in={
+            review.title_id for _, review in created + updated}))
+        for status, reviews in (('created', created), ('updated', updated)):
+            for index, review in reviews:
+                results[index] = {
+                    'index': index, 'status': status, 'id': review.id}
+
+    def fill_ids(self, reviews):
+        """id новых отзывов, если база не вернула их из bulk_create."""
+        if not reviews or reviews[0].id is not None:
+            return
+        ids = {
+            (title_id, author_id): pk
+            for pk, title_id, author_id in Review.objects.filter(
+                title_id__in={review.title_id for review in reviews},
+                author_id__in={review.author_id for review in reviews},
+            ).values_list('id', 'title_id', 'author_id')
+        }
+        for review in reviews:
+            review.id = ids[(review.title_id, review.author_id)]
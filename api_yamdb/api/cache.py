@@ -0,0 +1,204 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .db import primary_reads, replica_queries
+from .metrics import RESPONSE_CACHE
+
+VERSION_KEY = 'api:version:{}'
+MODIFIED_KEY = 'api:modified:{}'
+RESPONSE_KEY = 'api:response:{}'
+LOCK_KEY = 'api:response-lock:{}'
+STATS_KEY = 'api:response-stats:{}'
+STATS = ('hit', 'miss', 'stale')
+
+
+def model_key(model):
+    return model._meta.label_lower
+
+
+def initial_version():
+    """Начало счетчика: больше прежних значений, даже если ключ вытеснен."""
+    return time.time_ns() // 1000
+
+
+def get_versions(models):
+    """Версии моделей: счетчики изменений в общем кеше."""
+    keys = [VERSION_KEY.format(model_key(model)) for model in models]
+    versions = cache.get_many(keys)
+    if len(versions) < len(keys):
+        for key in keys:
+            if key not in versions:
+                cache.add(key, initial_version(), None)
+        versions = cache.get_many(keys)
+    return tuple(versions.get(key) for key in keys)
+
+
+def get_last_modified(models):
+    """Время последнего изменения моделей для Last-Modified.
+
+    Заголовок с точностью до секунды безопасен, только когда секунда
+    изменения уже прошла, иначе запись в ту же секунду не изменила бы его.
+    В остальных случаях возвращается None.
+    """
+    now = time.time()
+    keys = [MODIFIED_KEY.format(model_key(model)) for model in models]
+    times = cache.get_many(keys)
+    for key in keys:
+        if key not in times and cache.add(key, now, None):
+            times[key] = now
+    if len(times) < len(keys):
+        return None
+    modified = int(max(times.values()))
+    return modified if now >= modified + 1 else None
+
+
+def bump_versions(*models):
+    """Помечает данные моделей изменившимися."""
+    for model in models:
+        key = VERSION_KEY.format(model_key(model))
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, initial_version(), None)
+    now = time.time()
+    cache.set_many(
+        {MODIFIED_KEY.format(model_key(model)): now for model in models},
+        None)
+
+
+def count(stat):
+    RESPONSE_CACHE.labels(stat).inc()
+    # Один incr на запрос, add - только для первого обращения.
+    key = STATS_KEY.format(stat)
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, None):
+            cache.incr(key)
+
+
+def response_cache_stats():
+    values = cache.get_many([STATS_KEY.format(stat) for stat in STATS])
+    stats = {stat: values.get(STATS_KEY.format(stat), 0) for stat in STATS}
+    total = sum(stats.values())
+    hits = stats['hit'] + stats['stale']
+    stats['hit_ratio'] = hits / total if total else 0
+    return stats
+
+
+def request_key(request):
+    """Ключ кеша: адрес и отсортированные параметры запроса."""
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    url = f'{request.scheme}://{request.get_host()}{request.path}?{query}'
+    return hashlib.md5(url.encode()).hexdigest()
+
+
+class ResponseCacheMixin:
+    """Кеширует ответы на анонимные GET запросы к списку.
+
+    Ответ сбрасывается, когда меняется любая из моделей cache_models.
+    Работает только с общим кешем (CACHE_SHARED): с LocMemCache запись в
+    одном воркере не сбросила бы ответы в остальных.
+    При RESPONSE_CACHE_STALE > 0 устаревший ответ отдается, пока один из
+    запросов пересчитывает данные. Ответ для кеша читается из default:
+    реплика может отставать от версий.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        timeout = settings.RESPONSE_CACHE_TIMEOUT
+        if (request.user.is_authenticated or not timeout
+                or not settings.CACHE_SHARED):
+            return handler(request, *args, **kwargs)
+        key = request_key(request)
+        versions = get_versions(self.cache_models)
+        entry = cache.get(RESPONSE_KEY.format(key))
+        if entry is not None and entry['versions'] == versions:
+            return self.cached(entry, 'hit')
+        lock_key = LOCK_KEY.format(key)
+        stale = settings.RESPONSE_CACHE_STALE
+        if entry is not None and stale and not cache.add(lock_key, 1, stale):
+            return self.cached(entry, 'stale')
+        count('miss')
+        with primary_reads():
+            response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(
+                RESPONSE_KEY.format(key),
+                {'versions': versions, 'data': response.data},
+                timeout,
+            )
+        if stale:
+            cache.delete(lock_key)
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def cached(self, entry, stat):
+        count(stat)
+        return Response(entry['data'], headers={'X-Cache': stat.upper()})
+
+
+class NotModifiedError(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """ETag и Last-Modified по версиям моделей cache_models.
+
+    Валидаторы считаются без сериализации ответа, If-None-Match и
+    If-Modified-Since отвечают 304 до обращения к базе. Нужен общий кеш
+    (CACHE_SHARED), иначе воркер, не видевший записи, ответил бы 304.
+    Ответ, прочитанный с реплики, валидаторы не получает: реплика может
+    отставать от версий, и клиент закрепил бы старые данные под новым ETag.
+    """
+    cache_models = ()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if (request.method not in ('GET', 'HEAD') or not self.cache_models
+                or not settings.CACHE_SHARED):
+            return
+        versions = get_versions(self.cache_models)
+        tag = hashlib.md5(
+            f'{request_key(request)}:{request.accepted_media_type}:'
+            f'{versions}'.encode()
+        ).hexdigest()
+        self.validators = (
+            f'W/{quote_etag(tag)}', get_last_modified(self.cache_models))
+        self.replica_queries = replica_queries()
+        etag, last_modified = self.validators
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            raise NotModifiedError(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModifiedError):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(
+            request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and (
+                response.status_code == 304
+                or response.status_code == 200
+                and replica_queries() == self.replica_queries):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,131 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+_local = threading.local()
+
+# Служебные таблицы: DatabaseCache (кеш, счетчики лимитов) и сессии
+# читаются и пишутся только в default и не закрепляют клиента за ней.
+UNROUTED_APPS = ('django_cache', 'sessions')
+
+
+def check_connections(**kwargs):
+    """Закрывает постоянные соединения, которые больше не работают.
+
+    Аналог CONN_HEALTH_CHECKS из Django 4.1: в начале запроса соединение,
+    оставшееся с прошлого запроса, проверяется SELECT 1 и при ошибке
+    закрывается, чтобы запрос открыл новое, а не упал.
+    """
+    for connection in connections.all():
+        if (connection.connection is not None
+                and connection.settings_dict.get('CONN_HEALTH_CHECKS')
+                and not connection.is_usable()):
+            connection.close()
+
+
+class ReadState:
+    """Маршрут чтений запроса: одна реплика на весь запрос."""
+
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self.written = False
+        self.alias = None
+        self.replica_queries = 0
+
+    def replica(self):
+        if (not settings.DATABASE_REPLICAS or not self.replicas
+                or self.written
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return None
+        if self.alias is None:
+            self.alias = random.choice(settings.DATABASE_REPLICAS)
+        return self.alias
+
+
+def read_state():
+    return getattr(_local, 'state', None)
+
+
+def reading_replica():
+    """Следующее чтение пойдет на реплику."""
+    state = read_state()
+    return state is not None and state.replica() is not None
+
+
+def replica_queries():
+    """Сколько раз роутер направил чтения запроса на реплику."""
+    state = read_state()
+    return 0 if state is None else state.replica_queries
+
+
+@contextmanager
+def replica_reads(enabled):
+    """Чтения внутри блока идут на реплики, пока не было записи."""
+    previous = read_state()
+    _local.state = state = ReadState(enabled)
+    try:
+        yield state
+    finally:
+        _local.state = previous
+
+
+@contextmanager
+def primary_reads():
+    """Чтения внутри блока идут в default.
+
+    Нужен для данных, которые кешируются по версиям моделей: реплика может
+    отставать от версии, и старые данные остались бы в кеше под новой.
+    """
+    state = read_state()
+    if state is None:
+        yield
+        return
+    replicas, state.replicas = state.replicas, False
+    try:
+        yield
+    finally:
+        state.replicas = replicas
+
+
+class ReplicaRouter:
+    """Чтение с DATABASE_REPLICAS внутри replica_reads, запись в default.
+
+    Запрос читает с одной реплики, выбранной при первом чтении, чтобы не
+    видеть то более новые, то более старые данные. После первой записи и
+    внутри транзакции чтения идут в default, чтобы запрос видел свои
+    изменения. Объекты, прочитанные с реплики, сохраняются через default.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in UNROUTED_APPS:
+            return None
+        state = read_state()
+        alias = state and state.replica()
+        if alias:
+            state.replica_queries += 1
+            return alias
+        return self.primary(hints)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in UNROUTED_APPS:
+            return None
+        state = read_state()
+        if state is not None:
+            state.written = True
+        return self.primary(hints)
+
+    def primary(self, hints):
+        instance = hints.get('instance')
+        if (instance is not None
+                and instance._state.db in settings.DATABASE_REPLICAS):
+            return DEFAULT_DB_ALIAS
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
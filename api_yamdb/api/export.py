@@ -0,0 +1,99 @@
+"""Потоковая выгрузка произведений и отзывов в NDJSON или CSV.
+
+Строки читаются через .iterator(chunk_size) - в PostgreSQL это серверный
+курсор, и отдаются StreamingHttpResponse по мере чтения, так что память не
+зависит от размера таблицы. CSV совпадает с файлами static/data по имени
+и колонкам, его можно загрузить обратно командой load_csv_data. Рейтинг
+произведений есть только в NDJSON: без reviews_count и score_sum он не
+загружается обратно, load_csv_data пересчитывает его по отзывам.
+"""
+import csv
+from datetime import datetime
+
+from django.conf import settings
+from django.db import router
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
+from rest_framework.views import APIView
+from reviews.models import Review, Title
+
+from .permissions import IsAdministrator
+from .read_serializers import format_datetime
+from .renderers import FastJSONRenderer
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def prepare(value):
+    return format_datetime(value) if isinstance(value, datetime) else value
+
+
+class ExportView(APIView):
+    model = None
+    # Имя файла из DATA_MODEL команды load_csv_data.
+    file_name = None
+    columns = ()
+    csv_columns = None
+    permission_classes = (IsAdministrator,)
+
+    def perform_content_negotiation(self, request, force=False):
+        # Accept: text/csv не должен давать 406, рендерер нужен для ошибок.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        output = request.query_params.get('output', 'ndjson')
+        if output not in CONTENT_TYPES:
+            raise ParseError(f'Неизвестный формат: {output}')
+        # База выбирается сейчас: строки читаются уже после выхода из
+        # ReplicaMiddleware, когда роутер направил бы их в default.
+        columns = (self.csv_columns or self.columns if output == 'csv'
+                   else self.columns)
+        rows = self.model.objects.using(
+            router.db_for_read(self.model)
+        ).order_by('id').values_list(
+            *columns).iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+        lines = (self.csv_lines(columns, rows) if output == 'csv'
+                 else self.ndjson_lines(columns, rows))
+        response = StreamingHttpResponse(
+            lines, content_type=CONTENT_TYPES[output])
+        response['Content-Disposition'] = (
+            f'attachment; filename="{self.file_name}.{output}"')
+        # nginx отдает строки сразу, не собирая ответ во временный файл.
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def csv_lines(self, columns, rows):
+        writer = csv.writer(Echo())
+        yield writer.writerow(columns)
+        for row in rows:
+            yield writer.writerow([prepare(value) for value in row])
+
+    def ndjson_lines(self, columns, rows):
+        render = FastJSONRenderer().render
+        for row in rows:
+            yield render(dict(zip(columns, map(prepare, row)))) + b'\n'
+
+
+class TitleExportView(ExportView):
+    """Колонки titles.csv и описание, в NDJSON еще рейтинг."""
+    model = Title
+    file_name = 'titles'
+    columns = ('id', 'name', 'year', 'category', 'description', 'rating')
+    csv_columns = ('id', 'name', 'year', 'category', 'description')
+
+
+class ReviewExportView(ExportView):
+    """Колонки review.csv."""
+    model = Review
+    file_name = 'review'
+    columns = ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
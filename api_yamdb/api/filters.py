@@ -1,13 +1,61 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef
 from django_filters import CharFilter, FilterSet
-from reviews.models import Title
+from reviews.models import Category, Genre, GenreTitle, Title
+
+from .cache import get_versions
+from .db import reading_replica
+from .search import filter_contains
+
+SLUG_KEY = 'api:slug:{}:{}:{}'
+
+
+def get_id(model, slug):
+    return model.objects.filter(slug=slug).values_list(
+        'pk', flat=True).first() or 0
+
+
+def slug_to_id(model, slug):
+    """id объекта по slug, закешированный до изменения модели.
+
+    Кеш только общий (CACHE_SHARED): версии модели в LocMemCache
+    сбрасываются лишь в воркере, который ее изменил.
+    """
+    if not settings.CACHE_SHARED:
+        return get_id(model, slug)
+    key = SLUG_KEY.format(
+        model._meta.label_lower, get_versions((model,))[0], slug)
+    pk = cache.get(key)
+    if pk is None:
+        pk = get_id(model, slug)
+        if not reading_replica():
+            cache.set(key, pk)
+    return pk
 
 
 class TitleFilter(FilterSet):
-    """Кастомный фильтр для Title. Жанры и категории по slug."""
-    name = CharFilter(field_name='name', lookup_expr='contains')
-    genre = CharFilter(field_name='genre__slug')
-    category = CharFilter(field_name='category__slug')
+    """Кастомный фильтр для Title. Жанры и категории по slug.
+
+    Slug заранее переводится в id, жанр проверяется через EXISTS по
+    индексу (genre_id, title_id) без JOIN и дублей.
+    """
+    name = CharFilter(method='filter_name')
+    genre = CharFilter(method='filter_genre')
+    category = CharFilter(method='filter_category')
 
     class Meta:
         model = Title
         fields = ('name', 'year', 'category', 'genre')
+
+    def filter_name(self, queryset, name, value):
+        return filter_contains(queryset, name, value)
+
+    def filter_genre(self, queryset, name, value):
+        genre_titles = GenreTitle.objects.filter(
+            genre_id=slug_to_id(Genre, value), title_id=OuterRef('pk'))
+        return queryset.annotate(
+            has_genre=Exists(genre_titles)).filter(has_genre=True)
+
+    def filter_category(self, queryset, name, value):
+        return queryset.filter(category_id=slug_to_id(Category, value))
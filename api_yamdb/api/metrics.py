@@ -0,0 +1,102 @@
+"""Метрики Prometheus.
+
+При запуске в несколько процессов gunicorn значения пишутся в mmap файлы
+папки PROMETHEUS_MULTIPROC_DIR и собираются MultiProcessCollector при
+запросе /metrics.
+"""
+import os
+import threading
+import time
+
+from django.http import HttpResponse
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY,
+                               CollectorRegistry, Counter, Gauge, Histogram,
+                               generate_latest, multiprocess)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUEST_LATENCY = Histogram(
+    'yamdb_request_duration_seconds', 'Время ответа по маршруту DRF.',
+    ['route', 'method'], buckets=LATENCY_BUCKETS)
+REQUESTS = Counter(
+    'yamdb_requests_total', 'Ответы по маршруту и статусу.',
+    ['route', 'method', 'status'])
+REQUESTS_IN_FLIGHT = Gauge(
+    'yamdb_requests_in_flight', 'Запросы в обработке.',
+    multiprocess_mode='livesum')
+DB_QUERIES = Counter(
+    'yamdb_db_queries_total', 'Запросы к базе по маршруту.', ['route'])
+DB_CONNECTIONS_CREATED = Counter(
+    'yamdb_db_connections_created_total',
+    'Новые соединения с базой: при CONN_MAX_AGE - переподключения.',
+    ['alias'])
+DB_CONNECTIONS_OPEN = Gauge(
+    'yamdb_db_connections_open', 'Открытые соединения с базой.',
+    ['alias'], multiprocess_mode='livesum')
+RESPONSE_CACHE = Counter(
+    'yamdb_response_cache_total', 'Обращения к кешу ответов.', ['result'])
+USER_CACHE = Counter(
+    'yamdb_user_cache_total', 'Обращения к кешу пользователей JWT.',
+    ['result'])
+SIGNUPS = Counter(
+    'yamdb_signups_total', 'Регистрации, created - новый пользователь.',
+    ['created'])
+TOKENS_ISSUED = Counter('yamdb_tokens_issued_total', 'Выданные JWT токены.')
+THROTTLED = Counter(
+    'yamdb_throttled_total', 'Отклоненные лимитом запросы.', ['scope'])
+
+
+_opened = threading.local()
+
+
+def connection_opened(sender, connection, **kwargs):
+    """connection_created: соединение запоминается до закрытия."""
+    DB_CONNECTIONS_CREATED.labels(connection.alias).inc()
+    DB_CONNECTIONS_OPEN.labels(connection.alias).inc()
+    if not hasattr(_opened, 'connections'):
+        _opened.connections = set()
+    _opened.connections.add(connection)
+
+
+def connections_closed(**kwargs):
+    """Уменьшает счетчик открытых соединений на закрытые в этом потоке.
+
+    Сигнала о закрытии соединения в Django нет, поэтому закрытые
+    соединения ищутся после close_old_connections в начале и в конце
+    запроса.
+    """
+    opened = getattr(_opened, 'connections', ())
+    for connection in [item for item in opened if item.connection is None]:
+        DB_CONNECTIONS_OPEN.labels(connection.alias).dec()
+        opened.discard(connection)
+
+
+class QueryCounter:
+    """execute_wrapper, считающий запросы к базе."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def observe_request(request, response, start, queries):
+    match = request.resolver_match
+    route = match.url_name if match and match.url_name else 'unmatched'
+    REQUEST_LATENCY.labels(route, request.method).observe(
+        time.perf_counter() - start)
+    REQUESTS.labels(route, request.method, response.status_code).inc()
+    if queries:
+        DB_QUERIES.labels(route).inc(queries)
+
+
+def metrics_view(request):
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
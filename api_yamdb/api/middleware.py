@@ -0,0 +1,177 @@
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from .db import replica_reads
+from .metrics import REQUESTS_IN_FLIGHT, QueryCounter, observe_request
+
+logger = logging.getLogger('api.timing')
+
+SQL_LOG_LENGTH = 300
+
+PRIMARY_COOKIE = 'yamdb_primary'
+
+_route_stats = {}
+_route_stats_lock = threading.Lock()
+
+
+class QueryRecorder:
+    """execute_wrapper: число запросов, время в базе и самый долгий."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = (0.0, None)
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.count += 1
+            self.duration += duration
+            if duration > self.slowest[0]:
+                self.slowest = (duration, sql)
+
+
+def record_route(route, timings):
+    with _route_stats_lock:
+        stats = _route_stats.setdefault(route, {
+            'route': route, 'requests': 0, 'queries': 0, 'db_ms': 0.0,
+            'total_ms': 0.0, 'max_total_ms': 0.0, 'slowest_query_ms': 0.0,
+            'slowest_query': None,
+        })
+        stats['requests'] += 1
+        stats['queries'] += timings['queries']
+        stats['db_ms'] += timings['db_ms']
+        stats['total_ms'] += timings['total_ms']
+        stats['max_total_ms'] = max(
+            stats['max_total_ms'], timings['total_ms'])
+        if timings['slowest_query_ms'] > stats['slowest_query_ms']:
+            stats['slowest_query_ms'] = timings['slowest_query_ms']
+            stats['slowest_query'] = timings['slowest_query']
+
+
+def route_stats(order='db_ms'):
+    """Маршруты по убыванию суммарного order со средними на запрос."""
+    with _route_stats_lock:
+        rows = [dict(stats) for stats in _route_stats.values()]
+    for row in rows:
+        for field in ('queries', 'db_ms', 'total_ms'):
+            row[f'avg_{field}'] = row[field] / row['requests']
+    return sorted(rows, key=lambda row: row[order], reverse=True)
+
+
+def reset_route_stats():
+    with _route_stats_lock:
+        _route_stats.clear()
+
+
+class MetricsMiddleware:
+    """Метрики Prometheus: время ответа, запросы в обработке и к базе."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        counter = QueryCounter()
+        with REQUESTS_IN_FLIGHT.track_inprogress(), ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(counter))
+            response = self.get_response(request)
+        observe_request(request, response, start, counter.count)
+        return response
+
+
+class ReplicaMiddleware:
+    """GET, HEAD и OPTIONS читают с реплик, остальные запросы - с default.
+
+    После записи клиент получает cookie и следующие REPLICA_PIN_SECONDS
+    секунд читает с default, чтобы видеть свои изменения несмотря на
+    задержку репликации.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        enabled = (request.method in SAFE_METHODS
+                   and PRIMARY_COOKIE not in request.COOKIES)
+        with replica_reads(enabled) as state:
+            response = self.get_response(request)
+        if state.written and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PRIMARY_COOKIE, '1', max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True)
+        return response
+
+
+class QueryTimingMiddleware:
+    """Замеряет запросы к базе, время view и рендеринга ответа.
+
+    Для доли QUERY_TIMING_SAMPLE_RATE запросов добавляет заголовок
+    Server-Timing, пишет строку JSON в лог api.timing и копит статистику
+    по маршрутам для /api/v1/debug/timing/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.QUERY_TIMING_SAMPLE_RATE
+        if not rate or random.random() >= rate:
+            return self.get_response(request)
+        start = time.perf_counter()
+        recorder = QueryRecorder()
+        request._timing = {}
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(recorder))
+            response = self.get_response(request)
+        end = time.perf_counter()
+        marks = request._timing
+        view_end = marks.get('view_end', end)
+        slowest_duration, slowest_sql = recorder.slowest
+        match = request.resolver_match
+        timings = {
+            'route': match.url_name if match else None,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': recorder.count,
+            'db_ms': recorder.duration * 1000,
+            'slowest_query_ms': slowest_duration * 1000,
+            'slowest_query': slowest_sql and slowest_sql[:SQL_LOG_LENGTH],
+            'view_ms': (view_end - marks.get('view_start', start)) * 1000,
+            'render_ms': (end - view_end) * 1000,
+            'total_ms': (end - start) * 1000,
+        }
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={timings["db_ms"]:.2f};desc="{recorder.count} queries"',
+            f'view;dur={timings["view_ms"]:.2f}',
+            f'render;dur={timings["render_ms"]:.2f}',
+            f'total;dur={timings["total_ms"]:.2f}',
+        ))
+        logger.info(json.dumps(timings, ensure_ascii=False))
+        if timings['route']:
+            record_route(timings['route'], timings)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if hasattr(request, '_timing'):
+            request._timing['view_start'] = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Вызывается после view и до рендеринга ответа DRF в JSON.
+        if hasattr(request, '_timing'):
+            request._timing['view_end'] = time.perf_counter()
+        return response
@@ -1,14 +1,83 @@
+from django.conf import settings
+from django.http import Http404
 from rest_framework import filters, mixins, viewsets
+from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 
+from .cache import ConditionalGetMixin, ResponseCacheMixin
 from .permissions import IsAdministrator, IsReadOnly
+from .search import TrigramSearchFilter
 
 
-class CreateListDestroyMixins(mixins.CreateModelMixin,
+class ValuesReadMixin:
+    """GET списка и объекта через read_serializer_class по .values().
+
+    Ответ совпадает с serializer_class, отключается настройкой
+    FAST_READ_SERIALIZERS.
+    """
+    read_serializer_class = None
+
+    def use_read_serializer(self):
+        return (settings.FAST_READ_SERIALIZERS
+                and self.read_serializer_class is not None)
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_read_serializer():
+            return super().list(request, *args, **kwargs)
+        reader = self.read_serializer_class(
+            self.filter_queryset(self.get_queryset()))
+        rows = reader.get_rows()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(reader.serialize(page))
+        return Response(reader.serialize(rows))
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_read_serializer():
+            return super().retrieve(request, *args, **kwargs)
+        reader = self.read_serializer_class(
+            self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            reader.get_rows(),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, row)
+        return Response(reader.serialize([row])[0])
+
+
+class NestedListMixin:
+    """Список вложенных объектов одним запросом, без загрузки родителя.
+
+    Queryset фильтруется по id родителя из URL. Существование родителя
+    проверяется через exists() только для пустой страницы, чтобы список
+    несуществующего родителя по-прежнему отвечал 404.
+
+    parent_lookup: поле родителя -> параметр URL.
+    """
+    parent_model = None
+    parent_lookup = {}
+
+    def parent_exists(self):
+        return self.parent_model.objects.filter(**{
+            field: self.kwargs.get(kwarg)
+            for field, kwarg in self.parent_lookup.items()
+        }).exists()
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if page is not None and not page and not self.parent_exists():
+            raise Http404
+        return page
+
+
+class CreateListDestroyMixins(ConditionalGetMixin,
+                              ResponseCacheMixin,
+                              mixins.CreateModelMixin,
                               mixins.ListModelMixin,
                               mixins.DestroyModelMixin,
                               viewsets.GenericViewSet):
-    filter_backends = (filters.SearchFilter, filters.OrderingFilter)
+    filter_backends = (TrigramSearchFilter, filters.OrderingFilter)
     search_fields = ('name',)
     pagination_class = PageNumberPagination
     lookup_field = 'slug'
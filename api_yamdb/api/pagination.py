@@ -0,0 +1,192 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+from .cache import get_versions
+from .db import reading_replica
+
+COUNT_KEY = 'api:count:{}'
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по ключу (pub_date, id) без COUNT и OFFSET.
+
+    CursorPagination строит позицию только по первому полю сортировки и
+    пропускает строки с той же pub_date через OFFSET. Здесь позиция - пара
+    pub_date и id, страница выбирается условием по паре, поэтому строки
+    с одной pub_date (например, после массовой загрузки) не дают OFFSET.
+    """
+    ordering = ('pub_date', 'id')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+        position = None if self.cursor is None else self.cursor.position
+        queryset = queryset.order_by(*self.ordering)
+        if reverse:
+            queryset = queryset.reverse()
+        if position is not None:
+            queryset = queryset.filter(self.after(position, reverse))
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        following = None
+        if len(results) > len(self.page):
+            following = self._get_position_from_instance(
+                results[-1], self.ordering)
+        if reverse:
+            self.page.reverse()
+            self.next_position, self.previous_position = position, following
+        else:
+            self.next_position, self.previous_position = following, position
+        self.has_next = self.next_position is not None
+        self.has_previous = self.previous_position is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def after(self, position, reverse):
+        """Строки после позиции курсора в порядке обхода."""
+        pub_date, _, pk = position.partition('|')
+        try:
+            pub_date, pk = parse_datetime(pub_date), int(pk)
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        lookup = 'lt' if reverse else 'gt'
+        return (Q(**{f'pub_date__{lookup}': pub_date})
+                | Q(pub_date=pub_date, **{f'id__{lookup}': pk}))
+
+    def _get_position_from_instance(self, instance, ordering):
+        if isinstance(instance, dict):
+            pub_date, pk = instance['pub_date'], instance['id']
+        else:
+            pub_date, pk = instance.pub_date, instance.id
+        return f'{pub_date.isoformat()}|{pk}'
+
+
+class OptionalCursorPagination(PageNumberPagination):
+    """Постраничная пагинация, курсорная по ?pagination=cursor.
+
+    Номера страниц остаются пагинацией по умолчанию. Курсор включается
+    параметром pagination=cursor, а ссылки next/previous его сохраняют.
+    """
+    cursor_pagination_class = PubDateCursorPagination
+    mode_query_param = 'pagination'
+
+    def use_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.cursor_pagination_class.cursor_query_param
+            in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Постраничная пагинация без COUNT(*) на каждый запрос.
+
+    Способ подсчета задается атрибутом count_mode вьюсета:
+    exact - COUNT(*) как в PageNumberPagination;
+    cached - COUNT(*) кешируется по SQL запроса и версиям cache_models,
+    только при CACHE_SHARED;
+    estimate - для запроса без фильтров берется reltuples из pg_class,
+    в остальных случаях как cached;
+    capped - считается не больше count_cap строк, больше выводится
+    как "10000+".
+    """
+    count_mode = 'cached'
+    count_cap = 10000
+    count_timeout = 300
+    estimate_threshold = 100000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.view = view
+        self.count_capped = False
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, object_list, per_page):
+        paginator = Paginator(object_list, per_page)
+        paginator.count = self.get_count(object_list)
+        return paginator
+
+    def get_setting(self, name):
+        return getattr(self.view, name, getattr(self, name))
+
+    def get_count(self, queryset):
+        mode = self.get_setting('count_mode')
+        if mode == 'exact':
+            return queryset.count()
+        if mode == 'capped':
+            return self.capped_count(queryset)
+        if mode == 'estimate':
+            estimate = self.estimated_count(queryset)
+            if estimate is not None:
+                return estimate
+        return self.cached_count(queryset)
+
+    def cached_count(self, queryset):
+        # Без общего кеша версии не сбрасываются в других воркерах.
+        if not settings.CACHE_SHARED:
+            return queryset.count()
+        signature = f'{queryset.query}:{get_versions(self.view.cache_models)}'
+        key = COUNT_KEY.format(hashlib.md5(signature.encode()).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            # С реплики число может быть старше версий.
+            if not reading_replica():
+                cache.set(key, count, self.get_setting('count_timeout'))
+        return count
+
+    def capped_count(self, queryset):
+        cap = self.get_setting('count_cap')
+        count = queryset.order_by()[:cap + 1].count()
+        if count > cap:
+            self.count_capped = True
+            return cap
+        return count
+
+    def estimated_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < self.get_setting('estimate_threshold'):
+            return None
+        return int(row[0])
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count_capped:
+            response.data['count'] = f'{self.page.paginator.count}+'
+        return response
@@ -0,0 +1,93 @@
+"""Сериализаторы только для чтения по строкам .values().
+
+Отдают тот же JSON, что TitleSerializer, ReviewSerializer и
+CommentSerializer, но без экземпляров моделей и обхода полей DRF на каждый
+объект. Порядок ключей совпадает с Meta.fields сериализаторов, даты
+форматируются тем же DateTimeField.
+"""
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+from rest_framework import serializers
+from reviews.models import GenreTitle
+
+datetime_representation = serializers.DateTimeField().to_representation
+
+
+def format_datetime(value):
+    return None if value is None else datetime_representation(value)
+
+
+class ValuesReadSerializer(ABC):
+    """База: строки из .values(), в serialize - словари для ответа."""
+    values = ()
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    def get_rows(self):
+        return self.queryset.prefetch_related(None).values(*self.values)
+
+    @abstractmethod
+    def serialize(self, rows):
+        """Список словарей в формате ModelSerializer."""
+
+
+class TitleReadSerializer(ValuesReadSerializer):
+    """Вывод TitleSerializer: жанры страницы одним запросом."""
+    values = ('id', 'name', 'year', 'description', 'category_id',
+              'category__name', 'category__slug')
+
+    def __init__(self, queryset):
+        super().__init__(queryset)
+        self.rating = (
+            'live_rating' if 'live_rating' in queryset.query.annotations
+            else 'rating')
+        self.values = (*self.values, self.rating)
+
+    def serialize(self, rows):
+        genres = defaultdict(list)
+        for title_id, name, slug in GenreTitle.objects.filter(
+                title_id__in=[row['id'] for row in rows]
+        ).order_by('genre_id').values_list(
+                'title_id', 'genre__name', 'genre__slug'):
+            genres[title_id].append({'name': name, 'slug': slug})
+        return [{
+            'id': row['id'],
+            'name': row['name'],
+            'year': row['year'],
+            'description': row['description'],
+            'category': None if row['category_id'] is None else {
+                'name': row['category__name'],
+                'slug': row['category__slug'],
+            },
+            'genre': genres[row['id']],
+            'rating': row[self.rating],
+        } for row in rows]
+
+
+class ReviewReadSerializer(ValuesReadSerializer):
+    """Вывод ReviewSerializer."""
+    values = ('id', 'text', 'author__username', 'score', 'pub_date')
+
+    def serialize(self, rows):
+        return [{
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'score': row['score'],
+            'pub_date': format_datetime(row['pub_date']),
+        } for row in rows]
+
+
+class CommentReadSerializer(ValuesReadSerializer):
+    """Вывод CommentSerializer."""
+    values = ('id', 'text', 'author__username', 'pub_date')
+
+    def serialize(self, rows):
+        return [{
+            'id': row['id'],
+            'text': row['text'],
+            'author': row['author__username'],
+            'pub_date': format_datetime(row['pub_date']),
+        } for row in rows]
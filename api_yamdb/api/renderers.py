@@ -0,0 +1,84 @@
+import io
+
+from django.conf import settings
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders, json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+LINE_SEPARATORS = (('\u2028'.encode(), b'\\u2028'),
+                   ('\u2029'.encode(), b'\\u2029'))
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """JSONRenderer на orjson, если он установлен.
+
+    Результат совпадает с JSONRenderer: даты, время и Decimal передаются
+    в encoders.JSONEncoder. С отступами, ensure_ascii и для значений,
+    которые orjson не умеет, используется json из стандартной библиотеки.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoders.JSONEncoder().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        for separator, escaped in LINE_SEPARATORS:
+            if separator in ret:
+                ret = ret.replace(separator, escaped)
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    """JSONParser на orjson, ошибки разбираются стандартным json."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        content = stream.read()
+        if encoding.lower().replace('-', '') == 'utf8':
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(
+                content.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class NDJSONParser(FastJSONParser):
+    """Один JSON объект на строку, результат - список объектов."""
+    media_type = 'application/x-ndjson'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        items = []
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                items.append(super().parse(
+                    io.BytesIO(line), media_type, parser_context))
+            except ParseError as error:
+                raise ParseError(f'Строка {number}: {error.detail}')
+        return items
@@ -0,0 +1,153 @@
+import re
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connections
+from django.db.models import Case, FloatField, Q, Value, When
+from django.db.models.functions import Upper
+from rest_framework import filters
+
+from .cache import get_versions
+from .db import primary_reads
+
+SIMILARITY_THRESHOLD = 0.3
+WORD_RE = re.compile(r'\w+')
+
+
+def word_trigrams(text):
+    """Триграммы слов как в pg_trgm: слово дополняется пробелами."""
+    grams = set()
+    for word in WORD_RE.findall(text.lower()):
+        word = f'  {word} '
+        grams.update(word[i:i + 3] for i in range(len(word) - 2))
+    return grams
+
+
+def substring_trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def similarity(left, right):
+    if not left or not right:
+        return 0
+    return len(left & right) / len(left | right)
+
+
+class NgramIndex:
+    """Триграммный индекс в памяти процесса для баз без pg_trgm.
+
+    Перестраивается целиком после каждого изменения модели, поэтому
+    включается только настройкой SEARCH_MEMORY_INDEX для тестов на SQLite.
+    """
+
+    def __init__(self, rows):
+        self.texts = {}
+        self.words = {}
+        self.substrings = defaultdict(set)
+        self.word_grams = defaultdict(set)
+        for pk, text in rows:
+            self.texts[pk] = text.lower()
+            self.words[pk] = word_trigrams(text)
+            for gram in substring_trigrams(text):
+                self.substrings[gram].add(pk)
+            for gram in self.words[pk]:
+                self.word_grams[gram].add(pk)
+
+    def contains(self, term):
+        term = term.lower()
+        grams = substring_trigrams(term)
+        if grams:
+            candidates = set.intersection(
+                *(self.substrings.get(gram, set()) for gram in grams))
+        else:
+            candidates = self.texts
+        return {pk for pk in candidates if term in self.texts[pk]}
+
+    def search(self, term):
+        """Возвращает {pk: ранг} совпадений по подстроке и схожести."""
+        grams = word_trigrams(term)
+        candidates = set()
+        for gram in grams:
+            candidates.update(self.word_grams.get(gram, ()))
+        ranks = {}
+        for pk in candidates | self.contains(term):
+            rank = similarity(grams, self.words[pk])
+            if rank >= SIMILARITY_THRESHOLD or term.lower() in self.texts[pk]:
+                ranks[pk] = rank
+        return ranks
+
+
+_indexes = {}
+
+
+def get_ngram_index(queryset, field):
+    model = queryset.model
+    versions = get_versions((model,))
+    # Индекс хранится по версиям, строки для него читаются не с реплики.
+    with primary_reads():
+        key = (queryset.db, model._meta.label, field)
+        cached = _indexes.get(key)
+        if cached is None or cached[0] != versions:
+            rows = model._default_manager.using(queryset.db).values_list(
+                'pk', field)
+            cached = (versions, NgramIndex(rows.iterator()))
+            _indexes[key] = cached
+    return cached[1]
+
+
+def use_trigram_index(queryset):
+    return connections[queryset.db].vendor == 'postgresql'
+
+
+def use_memory_index(queryset):
+    return not use_trigram_index(queryset) and settings.SEARCH_MEMORY_INDEX
+
+
+def filter_contains(queryset, field, term):
+    """Регистронезависимый поиск по подстроке.
+
+    В PostgreSQL использует GIN индекс gin_trgm_ops по UPPER(field).
+    """
+    if not use_memory_index(queryset):
+        return queryset.filter(**{f'{field}__icontains': term})
+    return queryset.filter(
+        pk__in=get_ngram_index(queryset, field).contains(term))
+
+
+def search(queryset, field, term):
+    """Поиск по подстроке и схожести, отсортированный по релевантности.
+
+    Без PostgreSQL и SEARCH_MEMORY_INDEX - только поиск по подстроке.
+    """
+    if not use_trigram_index(queryset) and not use_memory_index(queryset):
+        return queryset.filter(**{f'{field}__icontains': term})
+    if use_trigram_index(queryset):
+        upper_term = term.upper()
+        return queryset.annotate(
+            search_field=Upper(field),
+            search_rank=TrigramSimilarity(field, term),
+        ).filter(
+            Q(search_field__contains=upper_term)
+            | Q(search_field__trigram_similar=upper_term)
+        ).order_by('-search_rank', 'pk')
+    ranks = get_ngram_index(queryset, field).search(term)
+    return queryset.filter(pk__in=ranks).annotate(
+        search_rank=Case(
+            *(When(pk=pk, then=Value(rank)) for pk, rank in ranks.items()),
+            default=Value(0),
+            output_field=FloatField(),
+        )
+    ).order_by('-search_rank', 'pk')
+
+
+class TrigramSearchFilter(filters.SearchFilter):
+    """?search= по первому из search_fields, сортировка по релевантности."""
+
+    def filter_queryset(self, request, queryset, view):
+        search_fields = self.get_search_fields(view, request)
+        term = ' '.join(self.get_search_terms(request))
+        if not search_fields or not term:
+            return queryset
+        return search(queryset, search_fields[0], term)
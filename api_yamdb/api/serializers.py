@@ -1,6 +1,5 @@
 from datetime import datetime
 
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from reviews.models import Category, Comment, Genre, Review, Title
 from users.models import User
@@ -35,7 +34,7 @@ class TitlePostPatchSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'category', 'genre')
         model = Title
 
     def validate_year(self, value):
@@ -49,12 +48,16 @@ class TitleSerializer(serializers.ModelSerializer):
     """Title serializer."""
     category = CategorySerializer()
     genre = GenreSerializer(many=True)
-    rating = serializers.FloatField()
+    rating = serializers.SerializerMethodField()
 
     class Meta:
-        fields = '__all__'
+        fields = ('id', 'name', 'year', 'description', 'category', 'genre',
+                  'rating')
         model = Title
 
+    def get_rating(self, obj):
+        return getattr(obj, 'live_rating', obj.rating)
+
 
 class ReviewSerializer(serializers.ModelSerializer):
     """Review serializer."""
@@ -72,18 +75,6 @@ class ReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('Неверный рейтинг')
         return value
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        title_id = self.context['view'].kwargs.get('id')
-        title = get_object_or_404(Title, pk=title_id)
-        user = self.context['request'].user
-        if Review.objects.filter(title=title, author=user).exists():
-            raise serializers.ValidationError(
-                'Вы уже оставляли отзыв к этому произведению'
-            )
-        return data
-
 
 class CommentSerializer(serializers.ModelSerializer):
     """Comment serializer."""
@@ -97,6 +88,44 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
 
 
+class TitleBulkSerializer(serializers.ModelSerializer):
+    """Произведение для массовой записи: категория и жанры по slug.
+
+    Slug не проверяются здесь, чтобы не делать запросов на каждый объект,
+    они переводятся в id один раз на весь запрос.
+    """
+    id = serializers.IntegerField(required=False, min_value=1)
+    category = serializers.SlugField()
+    genre = serializers.ListField(child=serializers.SlugField())
+
+    class Meta:
+        fields = ('id', 'name', 'year', 'description', 'category', 'genre')
+        model = Title
+
+    validate_year = TitlePostPatchSerializer.validate_year
+
+
+class GenreBulkSerializer(serializers.ModelSerializer):
+    """Жанр для массовой записи, без запроса UniqueValidator на объект."""
+    slug = serializers.SlugField(max_length=50)
+
+    class Meta:
+        fields = ('name', 'slug')
+        model = Genre
+
+
+class ReviewBulkSerializer(serializers.ModelSerializer):
+    """Отзыв для массовой записи: произведение по id, автор по username."""
+    title = serializers.IntegerField(min_value=1)
+    author = serializers.CharField(max_length=150)
+
+    class Meta:
+        fields = ('title', 'author', 'text', 'score')
+        model = Review
+
+    validate_score = ReviewSerializer.validate_score
+
+
 class UserRegSerializer(serializers.Serializer):
     """User registration serializer."""
     email = serializers.EmailField(
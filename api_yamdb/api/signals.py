@@ -0,0 +1,24 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.models import User
+
+from .cache import bump_versions
+
+CACHED_MODELS = (Category, Comment, Genre, GenreTitle, Review, Title, User)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def model_changed(sender, **kwargs):
+    # После коммита: иначе параллельный GET закеширует старые строки под
+    # новой версией.
+    if sender in CACHED_MODELS:
+        transaction.on_commit(lambda: bump_versions(sender))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def title_genres_changed(sender, action, **kwargs):
+    if action.startswith('post_'):
+        transaction.on_commit(lambda: bump_versions(GenreTitle))
@@ -0,0 +1,175 @@
+import threading
+import time
+from collections.abc import Mapping
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .metrics import THROTTLED
+
+THROTTLE_KEY = 'api:throttle:{}'
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class MemoryCounterStore:
+    """Счетчики в памяти процесса, для запуска в одном процессе."""
+    max_entries = 10000
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.data = {}
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        result = {}
+        for key in keys:
+            value, expires = self.data.get(key, (None, 0))
+            if expires > now:
+                result[key] = value
+        return result
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self.lock:
+            value, expires = self.data.get(key, (0, 0))
+            if expires <= now:
+                value, expires = 0, now + timeout
+            self.data[key] = (value + 1, expires)
+            if len(self.data) > self.max_entries:
+                self.cleanup(now)
+        return value + 1
+
+    def decr(self, key):
+        with self.lock:
+            value, expires = self.data.get(key, (0, 0))
+            if value > 0:
+                self.data[key] = (value - 1, expires)
+
+    def add(self, key, timeout):
+        now = time.monotonic()
+        with self.lock:
+            if self.data.get(key, (None, 0))[1] > now:
+                return False
+            self.data[key] = (1, now + timeout)
+            return True
+
+    def cleanup(self, now):
+        self.data = {
+            key: entry for key, entry in self.data.items() if entry[1] > now
+        }
+
+
+class CacheCounterStore:
+    """Счетчики в кеше Django: общие для воркеров с Redis или БД кешем."""
+
+    def get_many(self, keys):
+        return cache.get_many(keys)
+
+    def incr(self, key, timeout):
+        if cache.add(key, 1, timeout):
+            return 1
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout)
+            return 1
+
+    def decr(self, key):
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+
+    def add(self, key, timeout):
+        return cache.add(key, 1, timeout)
+
+
+@lru_cache(maxsize=None)
+def get_counter_store(path=None):
+    return import_string(path or settings.THROTTLE_COUNTER_STORE)()
+
+
+def parse_rate(rate):
+    count, period = rate.split('/')
+    return int(count), PERIODS[period[0]]
+
+
+def sliding_window_allow(store, key, limit, window, now=None):
+    """Скользящее окно по двум соседним счетчикам фиксированных окон.
+
+    Счетчик прошлого окна учитывается пропорционально той его части,
+    что еще попадает в скользящее окно. Счетчик текущего окна сначала
+    атомарно увеличивается, и решение принимается по его новому значению,
+    так что одновременные запросы не проходят сверх лимита. Для
+    отклоненного запроса увеличение откатывается.
+    """
+    now = time.time() if now is None else now
+    bucket = int(now // window)
+    current_key = f'{key}:{bucket}'
+    current = store.incr(current_key, window * 2)
+    previous_key = f'{key}:{bucket - 1}'
+    previous = store.get_many([previous_key]).get(previous_key, 0)
+    overlap = 1 - (now % window) / window
+    if previous * overlap + current > limit:
+        store.decr(current_key)
+        return False
+    return True
+
+
+def claim_cooldown(name, value, timeout):
+    """True, если значение не встречалось последние timeout секунд."""
+    key = THROTTLE_KEY.format(f'cooldown:{name}:{value.lower()}')
+    return get_counter_store().add(key, timeout)
+
+
+class AuthRateThrottle(BaseThrottle):
+    """Ограничение частоты по IP и полям запроса.
+
+    Лимиты берутся из DEFAULT_THROTTLE_RATES по ключам вида
+    <scope>_ip, <scope>_email, <scope>_username.
+    """
+    scope = None
+    fields = ('ip',)
+
+    def get_value(self, request, field):
+        if field == 'ip':
+            return self.get_ident(request)
+        # Тело может быть JSON массивом, его отклонит сериализатор.
+        if not isinstance(request.data, Mapping):
+            return None
+        value = request.data.get(field)
+        return value.lower() if isinstance(value, str) and value else None
+
+    def allow_request(self, request, view):
+        store = get_counter_store()
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        self.waits = []
+        for field in self.fields:
+            rate = rates.get(f'{self.scope}_{field}')
+            value = self.get_value(request, field)
+            if not rate or not value:
+                continue
+            limit, window = parse_rate(rate)
+            key = THROTTLE_KEY.format(f'{self.scope}:{field}:{value}')
+            if not sliding_window_allow(store, key, limit, window):
+                self.waits.append(window - time.time() % window)
+                THROTTLED.labels(f'{self.scope}_{field}').inc()
+                return False
+        return True
+
+    def wait(self):
+        return max(self.waits) if self.waits else None
+
+
+class SignupRateThrottle(AuthRateThrottle):
+    scope = 'signup'
+    fields = ('ip', 'email', 'username')
+
+
+class TokenRateThrottle(AuthRateThrottle):
+    scope = 'token'
+    fields = ('ip', 'username')
@@ -1,8 +1,11 @@
 from django.urls import include, path
 from rest_framework import routers
 
+from .bulk import GenreBulkView, ReviewBulkView, TitleBulkView
+from .export import ReviewExportView, TitleExportView
 from .views import (CategoryViewSet, CommentViewSet, GenreViewSet,
-                    ReviewViewSet, TitleViewSet, UserViewSet, signup, token)
+                    ReviewViewSet, TitleViewSet, UserViewSet, cache_stats,
+                    signup, timing_stats, token)
 
 app_name = 'api'
 
@@ -24,6 +27,15 @@ router.register(
 
 urlpatterns = [
     path('v1/', include(router.urls)),
+    path('v1/bulk/titles/', TitleBulkView.as_view(), name='bulk_titles'),
+    path('v1/bulk/genres/', GenreBulkView.as_view(), name='bulk_genres'),
+    path('v1/bulk/reviews/', ReviewBulkView.as_view(), name='bulk_reviews'),
+    path('v1/export/titles/', TitleExportView.as_view(),
+         name='export_titles'),
+    path('v1/export/reviews/', ReviewExportView.as_view(),
+         name='export_reviews'),
     path('v1/auth/signup/', signup, name='signup'),
     path('v1/auth/token/', token, name='token'),
+    path('v1/cache/stats/', cache_stats, name='cache_stats'),
+    path('v1/debug/timing/', timing_stats, name='timing_stats'),
 ]
@@ -1,33 +1,47 @@
+from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.db.models import Avg
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import mixins, status, viewsets
-from rest_framework.decorators import action, api_view, permission_classes
-from rest_framework.exceptions import ParseError
+from rest_framework.decorators import (action, api_view, permission_classes,
+                                       throttle_classes)
+from rest_framework.exceptions import NotFound, ParseError, ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
-from reviews.models import Category, Genre, Review, Title
+from reviews.models import Category, Comment, Genre, GenreTitle, Review, Title
+from users.authentication import add_role_claims
 from users.models import User
+from users.outbox import enqueue_email
 
 from api_yamdb.settings import DEFAULT_FROM_EMAIL
 
+from .cache import (ConditionalGetMixin, ResponseCacheMixin,
+                    response_cache_stats)
 from .filters import TitleFilter
-from .mixins import CreateListDestroyMixins
+from .metrics import SIGNUPS, TOKENS_ISSUED
+from .middleware import reset_route_stats, route_stats
+from .mixins import CreateListDestroyMixins, NestedListMixin, ValuesReadMixin
+from .pagination import CachedCountPagination, OptionalCursorPagination
 from .permissions import IsAdministrator, IsOwnerOrReadOnly, IsReadOnly
+from .read_serializers import (CommentReadSerializer, ReviewReadSerializer,
+                               TitleReadSerializer)
+from .search import TrigramSearchFilter
 from .serializers import (CategorySerializer, CommentSerializer,
                           GenreSerializer, ReviewSerializer,
                           TitlePostPatchSerializer, TitleSerializer,
                           TokenSerializer, UserRegSerializer, UserSerializer)
+from .throttling import SignupRateThrottle, TokenRateThrottle, claim_cooldown
 
 SUBJECT = 'YaMDb: код подверждения'
 MESSAGE = 'Ваш код подтверждения - {}'
 FIELD_ERROR = 'Неуникальное поле. Пользователь с таким {} уже существует'
+REVIEW_EXISTS = 'Вы уже оставляли отзыв к этому произведению'
 
 
 class CreateViewSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
@@ -47,30 +61,47 @@ class CategoryViewSet(CreateListDestroyMixins):
     """Вьюсет  Categories."""
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_models = (Category,)
 
 
 class GenreViewSet(CreateListDestroyMixins):
     """Вьюсет  Genres."""
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_models = (Genre,)
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(ConditionalGetMixin, ResponseCacheMixin, ValuesReadMixin,
+                   viewsets.ModelViewSet):
     """Вьюсет Titles."""
-    queryset = Title.objects.annotate(
-        rating=Avg('reviews__score')).order_by('id')
+    queryset = Title.objects.select_related('category').prefetch_related(
+        'genre').order_by('id')
     serializer_class = TitleSerializer
-    filter_backends = (DjangoFilterBackend,)
+    read_serializer_class = TitleReadSerializer
+    filter_backends = (DjangoFilterBackend, TrigramSearchFilter)
     filterset_fields = ('name', 'year', 'category', 'genre')
-    pagination_class = PageNumberPagination
+    search_fields = ('name',)
+    pagination_class = CachedCountPagination
+    count_mode = settings.TITLE_COUNT_MODE
     permission_classes = (IsAdministrator,)
     filterset_class = TitleFilter
+    cache_models = (Title, Category, Genre, GenreTitle, Review)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs)
 
     def get_serializer_class(self):
         if self.request.method in ['POST', 'PATCH']:
             return TitlePostPatchSerializer
         return TitleSerializer
 
+    def get_queryset(self):
+        if settings.RATING_LIVE_AGGREGATE:
+            return super().get_queryset().annotate(
+                live_rating=Avg('reviews__score'))
+        return super().get_queryset()
+
     def get_permissions(self):
         if self.request.method == 'GET':
             return (IsReadOnly(),)
@@ -91,13 +122,15 @@ class UserViewSet(viewsets.ModelViewSet):
         permission_classes=(IsAuthenticated,),
         url_path='me')
     def get_current_user_info(self, request):
-        serializer = UserSerializer(request.user)
+        # В request.user из кеша аутентификации только поля для прав.
+        user = User.objects.get(pk=request.user.pk)
+        serializer = UserSerializer(user)
         if 'role' in request.data:
             return Response(serializer.data,
                             status=status.HTTP_400_BAD_REQUEST)
         if request.method == 'PATCH':
             serializer = UserSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True)
 
@@ -108,11 +141,17 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ConditionalGetMixin, NestedListMixin, ValuesReadMixin,
+                    viewsets.ModelViewSet):
     """Вьюсет Reviews."""
     serializer_class = ReviewSerializer
+    read_serializer_class = ReviewReadSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsOwnerOrReadOnly)
+    cache_models = (Review, Title, User)
+    pagination_class = OptionalCursorPagination
+    parent_model = Title
+    parent_lookup = {'id': 'id'}
 
     def get_permissions(self):
         if self.action == 'retrieve':
@@ -120,8 +159,8 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        title = get_object_or_404(Title, id=self.kwargs['id'])
-        return title.reviews.all()
+        return Review.objects.filter(
+            title_id=self.kwargs['id']).select_related('author')
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -131,16 +170,47 @@ class ReviewViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED,
                         headers=headers)
 
-    def perform_create(self, serializer):
-        title = get_object_or_404(Title, id=self.kwargs['id'])
-        serializer.save(author=self.request.user, title=title)
-
+    def get_title(self):
+        """Произведение из URL, один запрос за время обработки."""
+        if not hasattr(self, '_title'):
+            self._title = get_object_or_404(
+                Title.objects.only('id'), id=self.kwargs['id'])
+        return self._title
 
-class CommentViewSet(viewsets.ModelViewSet):
+    def perform_create(self, serializer):
+        # Повторный отзыв отсекает ограничение unique_author_title, рейтинг
+        # обновляется сигналом в той же транзакции.
+        title = self.get_title()
+        try:
+            with transaction.atomic():
+                serializer.save(author=self.request.user, title=title)
+        except IntegrityError:
+            if not Review.objects.filter(
+                    title=title, author=self.request.user).exists():
+                raise
+            raise ValidationError(
+                {api_settings.NON_FIELD_ERRORS_KEY: [REVIEW_EXISTS]})
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
+
+class CommentViewSet(ConditionalGetMixin, NestedListMixin, ValuesReadMixin,
+                     viewsets.ModelViewSet):
     """Вьюсет Comments."""
     serializer_class = CommentSerializer
+    read_serializer_class = CommentReadSerializer
     permission_classes = (IsAuthenticatedOrReadOnly,
                           IsOwnerOrReadOnly)
+    cache_models = (Comment, Review, User)
+    pagination_class = OptionalCursorPagination
+    parent_model = Review
+    parent_lookup = {'id': 'id', 'title_id': 'title_id'}
 
     def get_permissions(self):
         if self.action == 'retrieve':
@@ -148,12 +218,10 @@ class CommentViewSet(viewsets.ModelViewSet):
         return super().get_permissions()
 
     def get_queryset(self):
-        title_id = self.kwargs.get('title_id')
-        review = get_object_or_404(
-            Review, pk=self.kwargs.get('id'),
-            title__id=title_id
-        )
-        return review.comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author')
 
     def perform_create(self, serializer):
         title_id = self.kwargs.get('title_id')
@@ -165,8 +233,31 @@ class CommentViewSet(viewsets.ModelViewSet):
         )
 
 
+@api_view(['GET'])
+@permission_classes([IsAdministrator])
+def cache_stats(request):
+    """Счетчики попаданий в кеш ответов."""
+    return Response(response_cache_stats())
+
+
+@api_view(['GET', 'DELETE'])
+@permission_classes([AllowAny])
+def timing_stats(request):
+    """Маршруты с наибольшим временем в базе, только при DEBUG."""
+    if not settings.DEBUG:
+        raise NotFound
+    if request.method == 'DELETE':
+        reset_route_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    order = request.query_params.get('order', 'db_ms')
+    if order not in ('db_ms', 'total_ms', 'queries', 'requests'):
+        raise ParseError(f'Неизвестная сортировка: {order}')
+    return Response(route_stats(order))
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([SignupRateThrottle])
 def signup(request):
     """Вьюсет user register."""
     serializer = UserRegSerializer(data=request.data)
@@ -178,18 +269,23 @@ def signup(request):
         )
     except IntegrityError as error:
         return Response(f'{error}', status=status.HTTP_400_BAD_REQUEST)
+    SIGNUPS.labels(created).inc()
+    if not claim_cooldown(
+            'signup', user.email, settings.SIGNUP_EMAIL_COOLDOWN):
+        return Response(serializer.data, status=status.HTTP_200_OK)
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    enqueue_email(
         SUBJECT,
         MESSAGE.format(confirmation_code),
+        user.email,
         DEFAULT_FROM_EMAIL,
-        [user.email],
     )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([TokenRateThrottle])
 def token(request):
     serializer = TokenSerializer(data=request.data)
     serializer.is_valid(raise_exception=True)
@@ -201,7 +297,8 @@ def token(request):
             user,
             serializer.validated_data['confirmation_code']):
         return Response(status=status.HTTP_400_BAD_REQUEST)
-    token = AccessToken.for_user(user)
+    token = add_role_claims(AccessToken.for_user(user), user)
+    TOKENS_ISSUED.inc()
     data = {
         'token': str(token),
     }
@@ -3,14 +3,98 @@ ASGI config for YaMDb project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
-For more information on this file, see
-https://docs.djangoproject.com/en/3.0/howto/deployment/asgi/
+Django 2.2 has no ASGI handler, so the WSGI application is served from
+bounded thread pools: GET and HEAD requests to titles, reviews and comments
+run in their own pool and are not starved by slow writes.
+
+    gunicorn api_yamdb.asgi:application -k uvicorn.workers.UvicornWorker
 """
 
+import asyncio
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 
-from django.core.asgi import get_asgi_application
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from django.conf import settings
+from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
 
-application = get_asgi_application()
+READ_PATH_RE = re.compile(r'^/api/v1/titles/')
+
+
+def is_read_request(scope):
+    return (scope['method'] in ('GET', 'HEAD')
+            and READ_PATH_RE.match(scope['path']) is not None)
+
+
+class PooledWsgiInstance(WsgiToAsgiInstance):
+    """Запрос к WSGI приложению в потоке из переданного пула."""
+
+    def __init__(self, wsgi_application, executor):
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    async def run_wsgi_app(self, body):
+        await asyncio.get_running_loop().run_in_executor(
+            self.executor, self.run_sync, body)
+
+    def run_sync(self, body):
+        environ = self.build_environ(self.scope, body)
+        output = self.wsgi_application(environ, self.start_response)
+        try:
+            for chunk in output:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                self.sync_send({
+                    'type': 'http.response.body',
+                    'body': chunk,
+                    'more_body': True,
+                })
+        finally:
+            # Django шлет request_finished и закрывает соединения с БД.
+            if hasattr(output, 'close'):
+                output.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({'type': 'http.response.body'})
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+
+    def __init__(self, wsgi_application, read_threads, write_threads):
+        super().__init__(wsgi_application)
+        self.read_executor = ThreadPoolExecutor(
+            read_threads, thread_name_prefix='asgi-read')
+        self.write_executor = ThreadPoolExecutor(
+            write_threads, thread_name_prefix='asgi-write')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self.lifespan(receive, send)
+            return
+        executor = (self.read_executor if is_read_request(scope)
+                    else self.write_executor)
+        await PooledWsgiInstance(self.wsgi_application, executor)(
+            scope, receive, send)
+
+    async def lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.read_executor.shutdown(wait=True)
+                self.write_executor.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+application = PooledWsgiToAsgi(
+    get_wsgi_application(),
+    read_threads=settings.ASGI_READ_THREADS,
+    write_threads=settings.ASGI_WRITE_THREADS,
+)
@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'api',
     'reviews',
     'rest_framework',
@@ -27,6 +28,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.MetricsMiddleware',
+    'api.middleware.QueryTimingMiddleware',
+    'api.middleware.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -64,10 +68,38 @@ DATABASES = {
         'USER': os.getenv('POSTGRES_USER', default='postgres'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
-        'PORT': os.getenv('DB_PORT', default='5432')
+        'PORT': os.getenv('DB_PORT', default='5432'),
+        # Сколько секунд поток воркера держит соединение, 0 - новое
+        # соединение на каждый запрос.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default=60)),
+        # Проверять переиспользуемое соединение в начале запроса.
+        'CONN_HEALTH_CHECKS': os.getenv(
+            'DB_CONN_HEALTH_CHECKS', default='True').lower() in ('true', '1'),
+        # За внешним пулером (pgbouncer в режиме transaction) серверные
+        # курсоры .iterator() не переживают смену соединения.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_EXTERNAL_POOLER', default='False').lower() in ('true', '1'),
     }
 }
 
+# Реплики только для чтения, хосты через запятую. Остальные параметры
+# подключения как у default. GET запросы к API читают с реплик.
+DATABASE_REPLICAS = []
+for number, host in enumerate(
+        filter(None, os.getenv('DB_REPLICA_HOSTS', default='').split(',')),
+        start=1):
+    DATABASE_REPLICAS.append(f'replica_{number}')
+    DATABASES[f'replica_{number}'] = {
+        **DATABASES['default'],
+        'HOST': host.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['api.db.ReplicaRouter']
+
+# Сколько секунд после записи клиент читает с основной базы.
+REPLICA_PIN_SECONDS = int(os.getenv('REPLICA_PIN_SECONDS', default=15))
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -102,14 +134,101 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 AUTH_USER_MODEL = 'users.User'
 
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default='yamdb'),
+    }
+}
+
+# Кеш общий для всех процессов. LocMemCache и DummyCache у каждого воркера
+# свои, с ними кеши, которые сбрасываются при изменениях, не включаются.
+# True можно задать для LocMemCache, если сервер работает одним процессом.
+CACHE_SHARED = os.getenv('CACHE_SHARED', default=str(
+    CACHES['default']['BACKEND'] not in (
+        'django.core.cache.backends.locmem.LocMemCache',
+        'django.core.cache.backends.dummy.DummyCache',
+    ))).lower() in ('true', '1')
+
+# Сколько секунд аутентифицированный пользователь живет в кеше, только при
+# общем кеше (CACHE_SHARED).
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', default=60))
+
+
+# Кеш ответов на анонимные GET запросы к titles, categories и genres,
+# только при CACHE_SHARED.
+# 0 отключает кеш. RESPONSE_CACHE_STALE - сколько секунд можно отдавать
+# устаревший ответ, пока он пересчитывается.
+RESPONSE_CACHE_TIMEOUT = int(os.getenv('RESPONSE_CACHE_TIMEOUT', default=300))
+RESPONSE_CACHE_STALE = int(os.getenv('RESPONSE_CACHE_STALE', default=0))
+
+# Поиск с учетом опечаток без PostgreSQL: триграммный индекс в памяти
+# процесса, который перестраивается после каждой записи. Только для тестов
+# на SQLite, в остальных случаях без PostgreSQL ищется подстрока.
+SEARCH_MEMORY_INDEX = False
+
+# Как считать count в списке произведений: exact, cached, estimate, capped.
+TITLE_COUNT_MODE = os.getenv('TITLE_COUNT_MODE', default='cached')
+
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',),
+        'users.authentication.CachedJWTAuthentication',),
     'DEFAULT_PAGINATION_CLASS':
         'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    # orjson, если установлен, иначе json из стандартной библиотеки.
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Сколько прокси перед приложением (nginx): IP клиента берется из
+    # X-Forwarded-For, добавленного ближайшим прокси, а не целиком из
+    # заголовка, который клиент может подделать.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default=1)),
+    # Лимиты /auth/signup/ и /auth/token/ по IP, email и username.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': os.getenv('SIGNUP_RATE_IP', default='20/hour'),
+        'signup_email': os.getenv('SIGNUP_RATE_EMAIL', default='5/hour'),
+        'signup_username': os.getenv(
+            'SIGNUP_RATE_USERNAME', default='5/hour'),
+        'token_ip': os.getenv('TOKEN_RATE_IP', default='30/min'),
+        'token_username': os.getenv('TOKEN_RATE_USERNAME', default='10/min'),
+    },
 }
 
+# Списки и объекты titles, reviews, comments на GET собираются из .values()
+# без ModelSerializer. Ответ тот же, False - через обычные сериализаторы.
+FAST_READ_SERIALIZERS = os.getenv(
+    'FAST_READ_SERIALIZERS', default='True').lower() in ('true', '1')
+
+# Хранилище счетчиков лимитов: MemoryCounterStore для одного процесса,
+# CacheCounterStore для нескольких воркеров (кеш в Redis или в БД).
+THROTTLE_COUNTER_STORE = os.getenv(
+    'THROTTLE_COUNTER_STORE', default='api.throttling.CacheCounterStore')
+
+# Повторное письмо с кодом на тот же email не раньше чем через N секунд.
+SIGNUP_EMAIL_COOLDOWN = int(os.getenv('SIGNUP_EMAIL_COOLDOWN', default=60))
+
+# Максимум объектов в одном запросе к /api/v1/bulk/.
+BULK_MAX_ITEMS = int(os.getenv('BULK_MAX_ITEMS', default=5000))
+
+# Сколько строк за раз читать из серверного курсора при выгрузке /export/.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', default=2000))
+
+
+# Считать рейтинг Avg('reviews__score') на каждый запрос вместо
+# сохраненного в Title. Нужен для сверки денормализованного рейтинга.
+RATING_LIVE_AGGREGATE = os.getenv(
+    'RATING_LIVE_AGGREGATE', default='False').lower() in ('true', '1')
+
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=1),
@@ -120,3 +239,36 @@ EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 DEFAULT_FROM_EMAIL = 'from@example.com'
+
+# Доля запросов, для которых замеряются запросы к БД и время ответа:
+# заголовок Server-Timing, строка в логе api.timing и /api/v1/debug/timing/.
+QUERY_TIMING_SAMPLE_RATE = float(
+    os.getenv('QUERY_TIMING_SAMPLE_RATE', default=0))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+# Потоки для запуска через ASGI (api_yamdb.asgi): чтение titles, reviews,
+# comments и остальные запросы. Каждый поток держит свое соединение с БД.
+ASGI_READ_THREADS = int(os.getenv('ASGI_READ_THREADS', default=16))
+ASGI_WRITE_THREADS = int(os.getenv('ASGI_WRITE_THREADS', default=4))
+
+# Письма отправляются из очереди командой send_emails.
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(
+    os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5))
+EMAIL_OUTBOX_RETRY_DELAY = int(
+    os.getenv('EMAIL_OUTBOX_RETRY_DELAY', default=60))
+# Через сколько секунд взятое, но не отправленное письмо снова в очереди.
+EMAIL_OUTBOX_SEND_TIMEOUT = int(
+    os.getenv('EMAIL_OUTBOX_SEND_TIMEOUT', default=300))
+# Сколько секунд хранить отправленные письма с кодами подтверждения.
+EMAIL_OUTBOX_RETENTION = int(
+    os.getenv('EMAIL_OUTBOX_RETENTION', default=24 * 60 * 60))
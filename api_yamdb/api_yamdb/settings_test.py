@@ -0,0 +1,26 @@
+"""Настройки для тестов: SQLite, если не задан DB_HOST с PostgreSQL."""
+import os
+
+from .settings import *  # noqa: F401,F403
+
+if not os.getenv('DB_HOST'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    }
+
+# Тесты идут в одном процессе, LocMemCache для них общий.
+CACHE_SHARED = True
+
+# Поиск по триграммам на SQLite.
+SEARCH_MEMORY_INDEX = True
+
+# Отдельная база вместо реплики для тестов маршрутизации чтения, по
+# умолчанию запросы на нее не идут.
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'TEST': {'NAME': 'test_yamdb_replica'} if os.getenv('DB_HOST') else {},
+}
+DATABASE_REPLICAS = []
@@ -0,0 +1,9 @@
+from django.core.management.color import no_style
+from django.db import connection
+
+
+def reset_sequences(models):
+    """Сдвигает sequence после вставки с явными id."""
+    with connection.cursor() as cursor:
+        for sql in connection.ops.sequence_reset_sql(no_style(), models):
+            cursor.execute(sql)
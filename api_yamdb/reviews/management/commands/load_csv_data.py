@@ -0,0 +1,297 @@
+import csv
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import islice
+from os.path import exists, join
+
+import django
+from api.cache import bump_versions
+from django.apps import apps
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, connections, transaction
+from reviews.db_utils import reset_sequences
+from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                            Title, User)
+from reviews.ratings import recalculate_ratings
+
+DATA_MODEL = {
+    'users': User,
+    'category': Category,
+    'genre': Genre,
+    'titles': Title,
+    'genre_title': GenreTitle,
+    'review': Review,
+    'comments': Comment,
+}
+
+BATCH_SIZE = 5000
+DATA_DIR = join(settings.BASE_DIR, 'static', 'data')
+
+
+def dependency_levels(models):
+    """Группирует модели в уровни: модель грузится после своих FK."""
+    dependencies = {
+        model: {
+            field.related_model for field in model._meta.concrete_fields
+            if field.is_relation and field.related_model in models
+            and field.related_model is not model
+        }
+        for model in models
+    }
+    levels = []
+    loaded = set()
+    while len(loaded) < len(models):
+        level = [
+            model for model in models
+            if model not in loaded and dependencies[model] <= loaded
+        ]
+        if not level:
+            raise CommandError('Циклическая зависимость между моделями.')
+        levels.append(level)
+        loaded.update(level)
+    return levels
+
+
+def read_batches(csv_file, batch_size):
+    """Читает CSV порциями, не загружая файл в память целиком."""
+    with open(csv_file, encoding='utf-8', newline='') as file:
+        reader = csv.DictReader(file)
+        while True:
+            batch = list(islice(reader, batch_size))
+            if not batch:
+                return
+            yield batch
+
+
+def resolve_columns(model, header):
+    """Сопоставляет колонки CSV полям модели."""
+    return [(column, model._meta.get_field(column)) for column in header]
+
+
+def load_id_maps(columns):
+    """Загружает id связанных объектов для проверки внешних ключей."""
+    return {
+        column: set(
+            field.related_model.objects.values_list('pk', flat=True)
+        )
+        for column, field in columns if field.is_relation
+    }
+
+
+def build_objects(model, columns, id_maps, rows, first_row):
+    objects = []
+    for number, row in enumerate(rows, start=first_row):
+        values = {}
+        for column, field in columns:
+            value = row[column]
+            if value == '' and field.null:
+                value = None
+            elif field.is_relation:
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise CommandError(
+                        f'Запись {number}: {column} должен быть id, '
+                        f'получено {value!r}.'
+                    )
+                if value not in id_maps[column]:
+                    raise CommandError(
+                        f'Запись {number}: {field.related_model.__name__} '
+                        f'с id={value} не найден.'
+                    )
+            else:
+                value = field.to_python(value)
+            values[field.attname] = value
+        objects.append(model(**values))
+    return objects
+
+
+def copy_value(value):
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def copy_objects(model, objects):
+    """Записывает объекты в PostgreSQL через COPY."""
+    fields = model._meta.concrete_fields
+    buffer = io.StringIO()
+    for obj in objects:
+        buffer.write('\t'.join(
+            copy_value(
+                field.get_db_prep_save(getattr(obj, field.attname), connection)
+            )
+            for field in fields
+        ))
+        buffer.write('\n')
+    buffer.seek(0)
+    columns = ', '.join(
+        connection.ops.quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {connection.ops.quote_name(model._meta.db_table)} '
+            f'({columns}) FROM STDIN',
+            buffer,
+        )
+
+
+@contextmanager
+def keep_csv_dates(model):
+    """Не даёт auto_now_add затереть даты из CSV."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def load_model(label, csv_file, batch_size, use_copy):
+    """Загружает один CSV в одной транзакции, возвращает число строк."""
+    model = apps.get_model(label)
+    use_copy = use_copy and connection.vendor == 'postgresql'
+    with open(csv_file, encoding='utf-8', newline='') as file:
+        columns = resolve_columns(model, next(csv.reader(file)))
+    id_maps = load_id_maps(columns)
+    count = 0
+    with transaction.atomic(), keep_csv_dates(model):
+        for rows in read_batches(csv_file, batch_size):
+            objects = build_objects(
+                model, columns, id_maps, rows, count + 1)
+            if use_copy:
+                copy_objects(model, objects)
+            else:
+                model.objects.bulk_create(objects, batch_size=min(
+                    batch_size,
+                    connection.ops.bulk_batch_size(
+                        model._meta.concrete_fields, objects),
+                ))
+            count += len(objects)
+    return count
+
+
+def timed_load(label, csv_file, batch_size, use_copy):
+    start = time.monotonic()
+    count = load_model(label, csv_file, batch_size, use_copy)
+    return label, count, time.monotonic() - start
+
+
+def init_worker():
+    """Каждый процесс открывает собственное соединение с базой."""
+    django.setup()
+    connections.close_all()
+
+
+def truncate(models):
+    """Очищает таблицы моделей, начиная с зависимых."""
+    tables = [
+        model._meta.db_table
+        for level in reversed(dependency_levels(models))
+        for model in level
+    ]
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sql_flush(
+                    no_style(), tables, (), allow_cascade=True):
+                cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    """Command for load csv data to database."""
+    help = 'Загружает данные из static/data/*.csv в базу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--noinput', '--no-input', action='store_false',
+            dest='interactive',
+            help='Не задавать вопросов, завершаться ошибкой.')
+        parser.add_argument(
+            '--truncate', action='store_true',
+            help='Очистить таблицы перед загрузкой.')
+        parser.add_argument(
+            '--batch-size', type=int, default=BATCH_SIZE,
+            help='Количество строк в одной записи в базу.')
+        parser.add_argument(
+            '--no-copy', action='store_false', dest='use_copy',
+            help='Не использовать COPY на PostgreSQL.')
+        parser.add_argument(
+            '--path', default=DATA_DIR,
+            help='Папка с CSV файлами.')
+        parser.add_argument(
+            '--jobs', type=int, default=min(4, os.cpu_count() or 1),
+            help='Количество процессов для независимых моделей.')
+
+    def handle(self, *args, **options):
+        models = list(DATA_MODEL.values())
+        if options['truncate']:
+            truncate(models)
+            self.stdout.write('Существующие объекты удалены.')
+        else:
+            self.check_db(models, options['interactive'])
+        files = {}
+        for filename, model in DATA_MODEL.items():
+            csv_file = join(options['path'], f'{filename}.csv')
+            if exists(csv_file):
+                files[model] = csv_file
+            else:
+                self.stdout.write(f'Файл {filename}.csv для заполнения '
+                                  f'{model.__name__} отсутвует.')
+        jobs = options['jobs']
+        if connection.vendor == 'sqlite' or connection.in_atomic_block:
+            jobs = 1
+        stats = []
+        for level in dependency_levels(models):
+            tasks = [
+                (model._meta.label, files[model], options['batch_size'],
+                 options['use_copy'])
+                for model in level if model in files
+            ]
+            stats.extend(self.run_level(tasks, jobs))
+        reset_sequences(models)
+        recalculate_ratings(Title.objects.all())
+        bump_versions(*models)
+        self.report(stats)
+
+    def run_level(self, tasks, jobs):
+        if jobs < 2 or len(tasks) < 2:
+            return [timed_load(*task) for task in tasks]
+        connections.close_all()
+        with ProcessPoolExecutor(
+                max_workers=min(jobs, len(tasks)),
+                initializer=init_worker) as executor:
+            futures = [executor.submit(timed_load, *task) for task in tasks]
+            return [future.result() for future in futures]
+
+    def report(self, stats):
+        for label, count, seconds in stats:
+            rate = count / seconds if seconds else 0
+            self.stdout.write(
+                f'{apps.get_model(label).__name__}: добавлено объектов - '
+                f'{count} за {seconds:.2f} с ({rate:.0f} строк/с).')
+
+    def check_db(self, models, interactive):
+        filled = [model for model in models if model.objects.exists()]
+        if not filled:
+            return
+        names = ', '.join(model.__name__ for model in filled)
+        if not interactive:
+            raise CommandError(
+                f'В базе уже есть объекты {names}. '
+                'Запустите команду с --truncate.')
+        result = input(f'В базе уже есть объекты {names}! '
+                       'Для удаления введите "Y" или что-нибудь '
+                       'другое для отмены и выхода: ')
+        if result not in ('Y', 'y'):
+            raise CommandError('Загрузка отменена.')
+        truncate(models)
@@ -0,0 +1,42 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+from reviews.models import Title
+from reviews.ratings import drifted_titles, recalculate_ratings
+
+
+class Command(BaseCommand):
+    """Command for repairing stored title ratings."""
+    help = 'Пересчитывает сохраненные рейтинги произведений по отзывам.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Пересчитать все произведения, а не только разошедшиеся.')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Только показать разошедшиеся произведения.')
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Количество произведений в одном UPDATE.')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            ids = Title.objects.values_list('id', flat=True)
+        else:
+            ids = drifted_titles(Title.objects.all()).values_list(
+                'id', flat=True)
+        ids = list(ids.order_by('id'))
+        if options['check']:
+            self.stdout.write(
+                f'Произведений с разошедшимся рейтингом: {len(ids)}')
+            if ids:
+                self.stdout.write(', '.join(map(str, ids)))
+            return
+        batch_size = options['batch_size']
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            with transaction.atomic():
+                updated += recalculate_ratings(
+                    Title.objects.filter(pk__in=ids[start:start + batch_size])
+                )
+        self.stdout.write(f'Рейтинг пересчитан у {updated} произведений.')
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_genres(apps, schema_editor):
+    GenreTitle = apps.get_model('reviews', 'GenreTitle')
+    duplicates = (
+        GenreTitle.objects.order_by().values('title', 'genre')
+        .annotate(first=Min('id'), count=Count('id')).filter(count__gt=1)
+    )
+    for row in duplicates.iterator():
+        GenreTitle.objects.filter(
+            title=row['title'], genre=row['genre']
+        ).exclude(id=row['first']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_genres, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='genretitle',
+            constraint=models.UniqueConstraint(fields=('title', 'genre'), name='unique_title_genre'),
+        ),
+        migrations.AddIndex(
+            model_name='genretitle',
+            index=models.Index(fields=['genre', 'title'], name='genretitle_genre_title_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='title',
+            index=models.Index(fields=['category', 'year'], name='title_category_year_idx'),
+        ),
+    ]
@@ -59,10 +59,20 @@ class Title(models.Model):
         through='GenreTitle',
         db_index=True,
     )
+    rating = models.FloatField('Рейтинг', null=True, blank=True)
+    reviews_count = models.PositiveIntegerField(
+        'Количество отзывов', default=0)
+    score_sum = models.PositiveIntegerField('Сумма оценок', default=0)
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=['category', 'year'],
+                name='title_category_year_idx'
+            )
+        ]
 
     def __str__(self):
         return self.name
@@ -84,6 +94,18 @@ class GenreTitle(models.Model):
     class Meta:
         verbose_name = 'Связь произведения с жанром'
         verbose_name_plural = 'Связи произведения с жанром'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['title', 'genre'],
+                name='unique_title_genre'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['genre', 'title'],
+                name='genretitle_genre_title_idx'
+            )
+        ]
 
 
 class Review(models.Model):
@@ -110,6 +132,18 @@ class Review(models.Model):
                 name='unique_author_title'
             )
         ]
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pubdate_id_idx'
+            )
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
 
     def __str__(self):
         return self.text
@@ -130,6 +164,12 @@ class Comment(models.Model):
         ordering = ['id']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pubdate_id_idx'
+            )
+        ]
 
     def __str__(self):
         return self.text
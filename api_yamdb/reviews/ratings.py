@@ -0,0 +1,68 @@
+from django.db.models import (Avg, Case, Count, F, FloatField, IntegerField,
+                              OuterRef, Q, Subquery, Sum, When)
+from django.db.models.functions import Abs, Cast, Coalesce, NullIf
+
+from .models import Review, Title
+
+# Avg в базе и деление суммы на число отзывов могут отличаться в последних
+# знаках, такая разница расхождением не считается.
+RATING_TOLERANCE = 1e-6
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    """Атомарно сдвигает сумму оценок, число отзывов и рейтинг Title."""
+    new_count = F('reviews_count') + count_delta
+    Title.objects.filter(pk=title_id).update(
+        score_sum=F('score_sum') + score_delta,
+        reviews_count=new_count,
+        rating=Case(
+            When(
+                reviews_count__gt=-count_delta,
+                then=Cast(F('score_sum') + score_delta, FloatField())
+                / new_count
+            ),
+            default=None,
+            output_field=FloatField(),
+        ),
+    )
+
+
+def _review_aggregate(aggregate, output_field):
+    return Subquery(
+        Review.objects.filter(title=OuterRef('pk'))
+        .order_by()
+        .values('title')
+        .annotate(value=aggregate)
+        .values('value'),
+        output_field=output_field,
+    )
+
+
+def recalculate_ratings(titles):
+    """Пересчитывает рейтинг произведений по таблице отзывов."""
+    return titles.update(
+        reviews_count=Coalesce(
+            _review_aggregate(Count('pk'), IntegerField()), 0),
+        score_sum=Coalesce(
+            _review_aggregate(Sum('score'), IntegerField()), 0),
+        rating=_review_aggregate(Avg('score'), FloatField()),
+    )
+
+
+def drifted_titles(titles):
+    """Произведения, у которых сохраненный рейтинг разошелся с отзывами."""
+    return titles.annotate(
+        actual_count=Count('reviews'),
+        actual_sum=Coalesce(Sum('reviews__score'), 0),
+    ).annotate(
+        rating_error=Abs(
+            F('rating')
+            - Cast(F('actual_sum'), FloatField())
+            / Cast(NullIf(F('actual_count'), 0), FloatField())
+        ),
+    ).exclude(
+        Q(actual_count=0, rating__isnull=True)
+        | Q(rating_error__isnull=False, rating_error__lte=RATING_TOLERANCE),
+        reviews_count=F('actual_count'),
+        score_sum=F('actual_sum'),
+    )
@@ -0,0 +1,40 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Review, Title
+from .ratings import recalculate_ratings, update_title_rating
+
+
+def _remember_loaded_values(instance):
+    instance._loaded_values = {
+        'title_id': instance.title_id,
+        'score': instance.score,
+    }
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if created:
+        update_title_rating(instance.title_id, instance.score, 1)
+    elif 'score' not in loaded or 'title_id' not in loaded:
+        recalculate_ratings(Title.objects.filter(pk=instance.title_id))
+    elif loaded['title_id'] != instance.title_id:
+        update_title_rating(loaded['title_id'], -loaded['score'], -1)
+        update_title_rating(instance.title_id, instance.score, 1)
+    elif loaded['score'] != instance.score:
+        update_title_rating(
+            instance.title_id, instance.score - loaded['score'], 0)
+    _remember_loaded_values(instance)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    update_title_rating(
+        loaded.get('title_id', instance.title_id),
+        -loaded.get('score', instance.score),
+        -1,
+    )
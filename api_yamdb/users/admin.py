@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import User
+from .models import OutgoingEmail, User
 
 
 @admin.register(User)
@@ -12,3 +12,13 @@ class UserAdmin(admin.ModelAdmin):
     list_filter = ('is_staff', 'role')
     list_editable = ('is_superuser', 'is_staff', 'role', 'email')
     empty_value_display = '-пусто-'
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """Outgoing email admin class."""
+    list_display = ('pk', 'recipient', 'subject', 'created', 'sent',
+                    'attempts')
+    search_fields = ('recipient',)
+    list_filter = ('sent',)
+    empty_value_display = '-пусто-'
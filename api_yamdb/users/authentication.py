@@ -0,0 +1,76 @@
+from api.db import reading_replica
+from api.metrics import USER_CACHE
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (AuthenticationFailed,
+                                                 InvalidToken)
+from rest_framework_simplejwt.settings import api_settings
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser')
+# Поля пользователя в кеше: только то, что нужно для проверки прав и
+# автора отзыва. Остальные поля, включая пароль, догружаются из базы.
+CACHED_FIELDS = ('id', 'username', 'is_active', *ROLE_CLAIMS)
+
+
+def user_cache_key(user_id):
+    return f'users:user:{user_id}'
+
+
+def add_role_claims(token, user):
+    """Кладет в токен поля, по которым проверяются права."""
+    for claim in ROLE_CLAIMS:
+        token[claim] = getattr(user, claim)
+    return token
+
+
+def claims_match(validated_token, user):
+    return all(
+        validated_token[claim] == getattr(user, claim)
+        for claim in ROLE_CLAIMS if claim in validated_token
+    )
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT аутентификация с кешированием пользователя.
+
+    Поля CACHED_FIELDS берутся из кеша на USER_CACHE_TIMEOUT секунд, если
+    кеш общий для всех воркеров. Если роль в кеше расходится с ролью в
+    токене, пользователь перечитывается из базы.
+    """
+
+    def get_user(self, validated_token):
+        if not settings.CACHE_SHARED or not settings.USER_CACHE_TIMEOUT:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                'Token contained no recognizable user identification')
+        key = user_cache_key(user_id)
+        values = cache.get(key)
+        if values is not None:
+            # from_db ждет значения в порядке полей модели.
+            fields = [
+                field.attname
+                for field in self.user_model._meta.concrete_fields
+                if field.attname in values
+            ]
+            user = self.user_model.from_db(
+                DEFAULT_DB_ALIAS, fields,
+                [values[field] for field in fields])
+            if claims_match(validated_token, user):
+                USER_CACHE.labels('hit').inc()
+                if not user.is_active:
+                    raise AuthenticationFailed(
+                        'User is inactive', code='user_inactive')
+                return user
+        USER_CACHE.labels('miss').inc()
+        user = super().get_user(validated_token)
+        # Реплика может отставать: старые права остались бы в кеше.
+        if not reading_replica():
+            cache.set(
+                key, {field: getattr(user, field) for field in CACHED_FIELDS},
+                settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+from users.outbox import prune_emails, send_pending
+
+
+class Command(BaseCommand):
+    """Command for sending queued emails."""
+    help = 'Отправляет письма из очереди OutgoingEmail.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Отправить накопившиеся письма и завершиться.')
+        parser.add_argument(
+            '--batch-size', type=int, default=100,
+            help='Сколько писем отправлять через одно соединение.')
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.')
+        parser.add_argument(
+            '--prune-interval', type=float, default=3600,
+            help='Как часто в секундах удалять старые письма.')
+
+    def handle(self, *args, **options):
+        pruned_at = None
+        while True:
+            close_old_connections()
+            now = time.monotonic()
+            if (pruned_at is None
+                    or now - pruned_at >= options['prune_interval']):
+                pruned_at = now
+                deleted = prune_emails()
+                if deleted:
+                    self.stdout.write(f'Удалено старых писем: {deleted}.')
+            sent = send_pending(options['batch_size'])
+            if sent:
+                self.stdout.write(f'Отправлено писем: {sent}.')
+            if options['once'] and sent < options['batch_size']:
+                return
+            if sent < options['batch_size']:
+                time.sleep(options['interval'])
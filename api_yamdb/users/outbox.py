@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+
+def enqueue_email(subject, body, recipient, from_email=None):
+    """Кладет письмо в очередь вместо отправки в запросе."""
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        body=body,
+        recipient=recipient,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+    )
+
+
+def postpone(email, error, now):
+    email.last_error = f'{error}'
+    email.send_after = now + timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1))
+
+
+def claim_pending(batch_size, now):
+    """Забирает пачку писем в короткой транзакции.
+
+    Письмам увеличивается число попыток и send_after сдвигается на
+    EMAIL_OUTBOX_SEND_TIMEOUT: другие воркеры их не возьмут, а если
+    отправка оборвется, письма снова попадут в очередь после таймаута.
+    """
+    with transaction.atomic():
+        emails = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                sent__isnull=True,
+                send_after__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            )[:batch_size]
+        )
+        for email in emails:
+            email.attempts += 1
+            email.send_after = now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_SEND_TIMEOUT)
+        OutgoingEmail.objects.bulk_update(emails, ('attempts', 'send_after'))
+    return emails
+
+
+def send_pending(batch_size=100):
+    """Отправляет пачку писем через одно SMTP соединение.
+
+    Письма забираются в транзакции, а отправляются уже после ее коммита,
+    чтобы не держать блокировки строк на время работы с SMTP.
+    Неотправленные письма откладываются с экспоненциальной задержкой,
+    после EMAIL_OUTBOX_MAX_ATTEMPTS попыток больше не отправляются.
+    Возвращает число отправленных писем.
+    """
+    now = timezone.now()
+    emails = claim_pending(batch_size, now)
+    if not emails:
+        return 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            postpone(email, error, now)
+    else:
+        for email in emails:
+            message = EmailMessage(
+                email.subject, email.body, email.from_email,
+                [email.recipient], connection=connection,
+            )
+            try:
+                message.send()
+            except Exception as error:
+                postpone(email, error, now)
+            else:
+                email.sent = timezone.now()
+                email.last_error = ''
+        connection.close()
+    OutgoingEmail.objects.bulk_update(
+        emails, ('sent', 'send_after', 'last_error'))
+    return sum(email.sent is not None for email in emails)
+
+
+def prune_emails():
+    """Удаляет отправленные и брошенные письма старше EMAIL_OUTBOX_RETENTION.
+
+    В письмах коды подтверждения, хранить их дольше не нужно.
+    """
+    cutoff = timezone.now() - timedelta(
+        seconds=settings.EMAIL_OUTBOX_RETENTION)
+    deleted, _ = OutgoingEmail.objects.filter(
+        Q(sent__lt=cutoff)
+        | Q(sent__isnull=True, created__lt=cutoff,
+            attempts__gte=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+    ).delete()
+    return deleted
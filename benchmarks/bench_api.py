@@ -0,0 +1,252 @@
+"""Бенчмарк эндпоинтов API через настоящие маршруты api/urls.py.
+
+Заполняет базу синтетическими данными до заданных объемов (повторный
+запуск досоздает только недостающее), прогоняет запросы тестовым
+клиентом Django в том же процессе и сохраняет p50/p95/p99, число запросов
+к базе и запросов в секунду по каждому эндпоинту в JSON:
+
+    python -m benchmarks.bench_api --titles 100000 --reviews 5000000 \\
+        --comments 20000000 --output results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.bench_api --compare results/old.json results/new.json
+"""
+import argparse
+import json
+import subprocess
+import time
+from datetime import datetime, timezone
+from itertools import islice
+
+from .utils import ROOT_DIR, percentiles, setup_django
+
+BATCH_SIZE = 5000
+ENDPOINTS = {
+    'titles-list': '/api/v1/titles/',
+    'titles-filter': '/api/v1/titles/?genre=genre-1&year={year}',
+    'titles-search': '/api/v1/titles/?search=Произведение 12',
+    'titles-detail': '/api/v1/titles/{title}/',
+    'categories-list': '/api/v1/categories/',
+    'genres-list': '/api/v1/genres/',
+    'reviews-list': '/api/v1/titles/{title}/reviews/',
+    'reviews-detail': '/api/v1/titles/{title}/reviews/{review}/',
+    'comments-list': '/api/v1/titles/{title}/reviews/{review}/comments/',
+}
+
+
+def bulk_insert(model, objects):
+    """Вставляет объекты из генератора порциями по BATCH_SIZE."""
+    from django.db import transaction
+
+    total = 0
+    while True:
+        batch = list(islice(objects, BATCH_SIZE))
+        if not batch:
+            return total
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+        total += len(batch)
+
+
+def spread(total, parents):
+    """Раскладывает total дочерних объектов поровну по id родителей."""
+    per_parent, extra = divmod(total, parents.count() or 1)
+    for number, parent_id in enumerate(parents.iterator()):
+        count = per_parent + (number < extra)
+        for position in range(count):
+            yield parent_id, position
+
+
+def seed(options):
+    from api.cache import bump_versions
+    from reviews.models import (Category, Comment, Genre, GenreTitle, Review,
+                                Title, User)
+    from reviews.ratings import recalculate_ratings
+
+    per_title = -(-options.reviews // options.titles)
+    users = max(options.users, per_title)
+    counts = {}
+    counts['users'] = bulk_insert(User, (
+        User(username=f'bench{i}', email=f'bench{i}@yamdb.fake')
+        for i in range(User.objects.count(), users)
+    ))
+    counts['categories'] = bulk_insert(Category, (
+        Category(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(Category.objects.count(), options.categories)
+    ))
+    counts['genres'] = bulk_insert(Genre, (
+        Genre(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(Genre.objects.count(), options.genres)
+    ))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    existing_titles = Title.objects.count()
+    counts['titles'] = bulk_insert(Title, (
+        Title(name=f'Произведение {i}', year=1900 + i % 120,
+              category_id=category_ids[i % len(category_ids)])
+        for i in range(existing_titles, options.titles)
+    ))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+    new_titles = Title.objects.order_by('id').values_list(
+        'id', flat=True)[existing_titles:]
+    counts['genre_title'] = bulk_insert(GenreTitle, (
+        GenreTitle(title_id=title_id, genre_id=genre_ids[(title_id + k)
+                                                         % len(genre_ids)])
+        for title_id in new_titles.iterator()
+        for k in range(title_id % min(3, len(genre_ids)) + 1)
+    ))
+    user_ids = list(User.objects.order_by('id').values_list('id', flat=True))
+    if not Review.objects.exists():
+        counts['reviews'] = bulk_insert(Review, (
+            Review(title_id=title_id, text='Отзыв', score=position % 10 + 1,
+                   author_id=user_ids[(title_id + position) % len(user_ids)])
+            for title_id, position in spread(
+                options.reviews, Title.objects.order_by('id').values_list(
+                    'id', flat=True))
+        ))
+        recalculate_ratings(Title.objects.all())
+    if not Comment.objects.exists():
+        counts['comments'] = bulk_insert(Comment, (
+            Comment(review_id=review_id, text='Комментарий',
+                    author_id=user_ids[(review_id + position)
+                                       % len(user_ids)])
+            for review_id, position in spread(
+                options.comments, Review.objects.order_by('id').values_list(
+                    'id', flat=True))
+        ))
+    bump_versions(Category, Comment, Genre, GenreTitle, Review, Title, User)
+    return counts
+
+
+def build_paths():
+    from reviews.models import Review
+
+    review = Review.objects.order_by('id').first()
+    if review is None:
+        return {}
+    params = {
+        'title': review.title_id,
+        'review': review.id,
+        'year': review.title.year,
+    }
+    return {name: path.format(**params) for name, path in ENDPOINTS.items()}
+
+
+def measure(client, path, repeat, cold):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    samples = []
+    queries = 0
+    status = None
+    for _ in range(repeat):
+        if cold:
+            cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            start = time.perf_counter()
+            response = client.get(path)
+            samples.append(time.perf_counter() - start)
+        queries += len(context.captured_queries)
+        status = response.status_code
+    p50, p95, p99 = percentiles([sample * 1000 for sample in samples])
+    return {
+        'path': path,
+        'status': status,
+        'p50_ms': round(p50, 3),
+        'p95_ms': round(p95, 3),
+        'p99_ms': round(p99, 3),
+        'queries_per_request': queries / repeat,
+        'rps': round(repeat / sum(samples), 1),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_result(name, result):
+    print(f'{name:<18} {result["status"]} '
+          f'p50={result["p50_ms"]:8.2f}ms p95={result["p95_ms"]:8.2f}ms '
+          f'p99={result["p99_ms"]:8.2f}ms '
+          f'queries={result["queries_per_request"]:5.1f} '
+          f'rps={result["rps"]:8.1f}')
+
+
+def compare(old_file, new_file):
+    with open(old_file) as file:
+        old = json.load(file)
+    with open(new_file) as file:
+        new = json.load(file)
+    print(f'{old["commit"]} -> {new["commit"]}')
+    for name, result in new['endpoints'].items():
+        before = old['endpoints'].get(name)
+        if before is None:
+            continue
+        change = (result['p50_ms'] - before['p50_ms']) / before['p50_ms']
+        print(f'{name:<18} p50 {before["p50_ms"]:8.2f} -> '
+              f'{result["p50_ms"]:8.2f}ms ({change:+.0%}) queries '
+              f'{before["queries_per_request"]:.1f} -> '
+              f'{result["queries_per_request"]:.1f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--titles', type=int, default=100000)
+    parser.add_argument('--reviews', type=int, default=5000000)
+    parser.add_argument('--comments', type=int, default=20000000)
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--genres', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--endpoint', action='append',
+                        help='Только указанные эндпоинты.')
+    parser.add_argument('--cold', action='store_true',
+                        help='Очищать кеш перед каждым запросом.')
+    parser.add_argument('--output', help='Файл для результатов в JSON.')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    setup_django()
+    from django.conf import settings
+    from django.test import Client
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    start = time.monotonic()
+    print(f'Добавлено: {seed(args)} за {time.monotonic() - start:.1f} с')
+    client = Client()
+    results = {}
+    for name, path in build_paths().items():
+        if args.endpoint and name not in args.endpoint:
+            continue
+        client.get(path)
+        results[name] = measure(client, path, args.repeat, args.cold)
+        print_result(name, results[name])
+    report = {
+        'commit': git_commit(),
+        'date': datetime.now(timezone.utc).isoformat(),
+        'database': settings.DATABASES['default']['ENGINE'],
+        'cache': settings.CACHES['default']['BACKEND'],
+        'cold': args.cold,
+        'repeat': args.repeat,
+        'dataset': {
+            'titles': args.titles, 'reviews': args.reviews,
+            'comments': args.comments, 'users': args.users,
+        },
+        'endpoints': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(report, file, indent=2, ensure_ascii=False)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""Бенчмарк /api/v1/titles/ с новым и постоянным соединением с базой.
+
+Запросы идут через WSGIHandler, как в gunicorn: сигналы request_started и
+request_finished закрывают или проверяют соединение так же, как в бою.
+Кеш ответов отключается, чтобы каждый запрос шел в базу.
+
+    DB_HOST=localhost python -m benchmarks.bench_connections --repeat 500
+"""
+import argparse
+
+from .utils import print_row, setup_django, timeit
+
+MODES = {
+    'CONN_MAX_AGE=0': {'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False},
+    'CONN_MAX_AGE=60': {'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': False},
+    'CONN_MAX_AGE=60 + health checks': {
+        'CONN_MAX_AGE': 60, 'CONN_HEALTH_CHECKS': True},
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--path', default='/api/v1/titles/')
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test import RequestFactory
+
+    settings.RESPONSE_CACHE_TIMEOUT = 0
+    handler = WSGIHandler()
+    environ = RequestFactory()._base_environ(
+        PATH_INFO=args.path, REQUEST_METHOD='GET')
+
+    def request():
+        statuses = []
+        response = handler(
+            dict(environ), lambda status, headers: statuses.append(status))
+        b''.join(response)
+        response.close()
+        assert statuses[0].startswith('200'), statuses
+
+    print(f'База: {connection.vendor}, {args.path}')
+    for name, options in MODES.items():
+        connection.close()
+        connection.settings_dict.update(options)
+        request()
+        print_row(name, timeit(request, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Микро-бенчмарк рендеринга вывода TitleSerializer в JSON.
+
+Сравнивает JSONRenderer из DRF с api.renderers.FastJSONRenderer на
+страницах разного размера. Объекты создаются в памяти, без базы.
+
+    python -m benchmarks.bench_renderer --repeat 200
+"""
+import argparse
+
+from .utils import print_row, setup_django, timeit
+
+
+def build_titles(count):
+    from reviews.models import Category, Genre, Title
+
+    genres = [Genre(id=i, name=f'Жанр {i}', slug=f'genre-{i}')
+              for i in range(5)]
+    categories = [Category(id=i, name=f'Категория {i}', slug=f'category-{i}')
+                  for i in range(3)]
+    titles = []
+    for i in range(1, count + 1):
+        title = Title(
+            id=i, name=f'Произведение {i}', year=1900 + i % 120,
+            description='Описание произведения ' * 5,
+            category=categories[i % len(categories)], rating=i % 100 / 10,
+        )
+        title._prefetched_objects_cache = {'genre': genres[:i % 3 + 1]}
+        titles.append(title)
+    return titles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.renderers import FastJSONRenderer, orjson
+    from api.serializers import TitleSerializer
+    from rest_framework.renderers import JSONRenderer
+
+    print(f'orjson: {"есть" if orjson else "не установлен"}')
+    for size in (10, 100, 1000):
+        data = {
+            'count': size, 'next': None, 'previous': None,
+            'results': TitleSerializer(build_titles(size), many=True).data,
+        }
+        expected = JSONRenderer().render(data)
+        assert FastJSONRenderer().render(data) == expected
+        print(f'{size} произведений, {len(expected)} байт')
+        for renderer in (JSONRenderer(), FastJSONRenderer()):
+            print_row(f'  {renderer.__class__.__name__}', timeit(
+                lambda: renderer.render(data), args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Бенчмарк поиска произведений по названию.
+
+Сравнивает старый LIKE '%x%' (name__contains) с api.search: GIN индексом
+pg_trgm в PostgreSQL или n-граммным индексом в памяти для SQLite.
+
+    python -m benchmarks.bench_search --titles 1000000
+"""
+import argparse
+import random
+
+from .utils import print_row, setup_django, timeit
+
+WORDS = ('побег', 'крестный', 'отец', 'властелин', 'колец', 'звездные',
+         'войны', 'матрица', 'начало', 'интерстеллар', 'бойцовский', 'клуб',
+         'зеленая', 'миля', 'форрест', 'гамп', 'список', 'шиндлера')
+
+
+def seed(count, batch_size=5000):
+    from reviews.models import Title
+
+    existing = Title.objects.count()
+    rnd = random.Random(existing)
+    for start in range(existing, count, batch_size):
+        Title.objects.bulk_create([
+            Title(
+                name=' '.join(rnd.sample(WORDS, 3)).capitalize()
+                + f' {number}',
+                year=rnd.randint(1900, 2020),
+            )
+            for number in range(start, min(start + batch_size, count))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--titles', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from api.search import filter_contains, search
+    from reviews.models import Title
+
+    seed(args.titles)
+    titles = Title.objects.all()
+    print(f'Произведений: {titles.count()}')
+    cases = {
+        'name__contains (LIKE)': lambda: list(
+            titles.filter(name__contains='Матрица')[:10]),
+        'name__contains, редкое значение': lambda: list(
+            titles.filter(name__contains='99999')[:10]),
+        'filter_contains, редкое значение': lambda: list(
+            filter_contains(titles, 'name', '99999')[:10]),
+        'filter_contains': lambda: list(
+            filter_contains(titles, 'name', 'матрица')[:10]),
+        'search (ранжирование)': lambda: list(
+            search(titles, 'name', 'матрица начало')[:10]),
+        'search с опечаткой': lambda: list(
+            search(titles, 'name', 'матрца')[:10]),
+    }
+    for name, case in cases.items():
+        case()
+        print_row(name, timeit(case, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
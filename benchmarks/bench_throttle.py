@@ -0,0 +1,62 @@
+"""Бенчмарк решения лимитера /auth/signup/ и /auth/token/.
+
+Измеряет sliding_window_allow на хранилищах счетчиков и полный
+SignupRateThrottle.allow_request (IP, email и username). Кеш для
+CacheCounterStore задается переменными CACHE_BACKEND и CACHE_LOCATION.
+
+    python -m benchmarks.bench_throttle --repeat 10000
+"""
+import argparse
+import itertools
+
+from .utils import print_row, setup_django, timeit
+
+STORES = ('api.throttling.MemoryCounterStore',
+          'api.throttling.CacheCounterStore')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=10000)
+    parser.add_argument('--keys', type=int, default=1000,
+                        help='Количество различных IP и email.')
+    args = parser.parse_args()
+
+    setup_django()
+    from api.throttling import (SignupRateThrottle, get_counter_store,
+                                sliding_window_allow)
+    from django.conf import settings
+    from rest_framework.parsers import JSONParser
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    print(f'Кеш: {settings.CACHES["default"]["BACKEND"]}')
+    keys = itertools.cycle(range(args.keys))
+    for path in STORES:
+        store = get_counter_store(path)
+        print_row(path.rsplit('.', 1)[1], timeit(
+            lambda: sliding_window_allow(
+                store, f'bench:{next(keys)}', 10 ** 9, 60),
+            args.repeat,
+        ))
+
+    factory = APIRequestFactory()
+    requests = [
+        Request(factory.post(
+            '/api/v1/auth/signup/',
+            {'username': f'user{i}', 'email': f'user{i}@yamdb.fake'},
+            format='json', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}',
+        ), parsers=[JSONParser()])
+        for i in range(args.keys)
+    ]
+    for request in requests:
+        request.data
+    requests = itertools.cycle(requests)
+    throttle = SignupRateThrottle()
+    print_row(f'SignupRateThrottle ({settings.THROTTLE_COUNTER_STORE})',
+              timeit(lambda: throttle.allow_request(next(requests), None),
+                     args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""Нагрузочный тест работающего сервера на нескольких уровнях конкурентности.
+
+Сравнение WSGI и ASGI запуска (из папки api_yamdb):
+
+    gunicorn api_yamdb.wsgi:application -w 4 --bind 0:8000
+    gunicorn api_yamdb.asgi:application -w 4 --bind 0:8001 \\
+        -k uvicorn.workers.UvicornWorker
+
+    python -m benchmarks.loadtest --url http://localhost:8000 \\
+        --url http://localhost:8001 --concurrency 1,8,32,64
+
+Запросы идут по списку --path по кругу, каждый поток держит свое
+keep-alive соединение.
+"""
+import argparse
+import http.client
+import itertools
+import threading
+import time
+from urllib.parse import urlsplit
+
+from .utils import percentiles
+
+PATHS = ('/api/v1/titles/', '/api/v1/titles/1/',
+         '/api/v1/titles/1/reviews/', '/api/v1/titles/1/reviews/1/comments/')
+
+
+def worker(url, paths, deadline, samples, errors):
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port)
+    for path in itertools.cycle(paths):
+        if time.monotonic() > deadline:
+            break
+        start = time.perf_counter()
+        try:
+            connection.request('GET', path)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(path)
+            connection.close()
+            continue
+        if response.status >= 500:
+            errors.append(path)
+        samples.append((time.perf_counter() - start) * 1000)
+    connection.close()
+
+
+def run(url, paths, concurrency, duration):
+    samples, errors = [], []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=worker, args=(url, paths, deadline, samples, errors))
+        for _ in range(concurrency)
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    p50, p95, p99 = percentiles(samples) if samples else (0, 0, 0)
+    print(f'{url:<24} c={concurrency:<4} rps={len(samples) / elapsed:8.1f} '
+          f'p50={p50:8.2f}ms p95={p95:8.2f}ms p99={p99:8.2f}ms '
+          f'errors={len(errors)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--url', action='append', required=True)
+    parser.add_argument('--path', action='append')
+    parser.add_argument('--concurrency', default='1,8,32,64')
+    parser.add_argument('--duration', type=float, default=10,
+                        help='Секунд на каждый уровень.')
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(',')]
+    for concurrency in levels:
+        for url in args.url:
+            run(url, args.path or PATHS, concurrency, args.duration)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Общий запуск Django для бенчмарков.
+
+Бенчмарки запускаются из корня репозитория, например:
+
+    DB_ENGINE=django.db.backends.sqlite3 DB_NAME=/tmp/bench.sqlite3 \\
+        python -m benchmarks.bench_search --titles 100000
+
+Без DB_* переменных используется PostgreSQL из api_yamdb/settings.py.
+"""
+import os
+import sys
+import time
+from os.path import abspath, dirname, join
+
+ROOT_DIR = dirname(dirname(abspath(__file__)))
+
+
+def setup_django():
+    sys.path.insert(0, join(ROOT_DIR, 'api_yamdb'))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+
+    call_command('migrate', verbosity=0)
+
+
+def timeit(func, repeat):
+    """Время выполнения func в миллисекундах: (p50, p95, p99)."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def percentile(ordered, fraction):
+    """Перцентиль отсортированных значений с линейной интерполяцией.
+
+    statistics.quantiles появился только в Python 3.8.
+    """
+    index = (len(ordered) - 1) * fraction
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    return tuple(percentile(ordered, fraction)
+                 for fraction in (0.5, 0.95, 0.99))
+
+
+def print_row(name, timings):
+    p50, p95, p99 = timings
+    print(f'{name:<40} p50={p50:8.2f}ms p95={p95:8.2f}ms p99={p99:8.2f}ms')
@@ -0,0 +1,79 @@
+import pytest
+
+
+@pytest.fixture
+def categories():
+    from reviews.models import Category
+
+    return [
+        Category.objects.create(name=f'Категория {i}', slug=f'category-{i}')
+        for i in range(2)
+    ]
+
+
+@pytest.fixture
+def genres():
+    from reviews.models import Genre
+
+    return [
+        Genre.objects.create(name=f'Жанр {i}', slug=f'genre-{i}')
+        for i in range(3)
+    ]
+
+
+@pytest.fixture
+def titles(categories, genres):
+    from reviews.models import Title
+
+    result = []
+    for i in range(15):
+        title = Title.objects.create(
+            name=f'Произведение {i}',
+            year=1990 + i,
+            category=categories[i % len(categories)],
+        )
+        title.genre.set(genres[:i % len(genres) + 1])
+        result.append(title)
+    return result
+
+
+@pytest.fixture
+def reviews(titles, django_user_model):
+    from reviews.models import Review
+
+    authors = [
+        django_user_model.objects.create_user(
+            username=f'author{i}', email=f'author{i}@yamdb.fake'
+        )
+        for i in range(3)
+    ]
+    return [
+        Review.objects.create(
+            title=title, author=author, text='Отзыв', score=i % 10 + 1
+        )
+        for i, (title, author) in enumerate(
+            (title, author) for title in titles[:5] for author in authors
+        )
+    ]
+
+
+@pytest.fixture
+def comments(reviews):
+    from reviews.models import Comment
+
+    return [
+        Comment.objects.create(
+            review=review, author=review.author, text=f'Комментарий {i}')
+        for i, review in enumerate(reviews[:3])
+    ]
+
+
+@pytest.fixture
+def review_comments(reviews):
+    from reviews.models import Comment
+
+    return [
+        Comment.objects.create(
+            review=reviews[0], author=review.author, text=f'Комментарий {i}')
+        for i, review in enumerate(reviews[:3])
+    ]
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+
+def call(application, method, path, body=b''):
+    messages = [{'type': 'http.request', 'body': body}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'query_string': b'',
+        'headers': [(b'host', b'testserver'),
+                    (b'content-type', b'application/json'),
+                    (b'content-length', str(len(body)).encode())],
+        'server': ('testserver', 80), 'scheme': 'http',
+        'http_version': '1.1',
+    }
+    asyncio.run(application(scope, receive, send))
+    content = b''.join(message.get('body', b'') for message in sent[1:])
+    return sent[0]['status'], content
+
+
+@pytest.mark.django_db(transaction=True)
+class TestAsgi:
+
+    def test_read_request(self, titles):
+        from api_yamdb.asgi import application
+
+        title = titles[0]
+        status, content = call(
+            application, 'GET', f'/api/v1/titles/{title.id}/')
+        assert status == 200
+        assert json.loads(content)['name'] == title.name
+
+    def test_write_request(self):
+        from users.models import User
+
+        from api_yamdb.asgi import application
+
+        status, content = call(
+            application, 'POST', '/api/v1/auth/signup/',
+            json.dumps(
+                {'username': 'asgi', 'email': 'asgi@yamdb.fake'}).encode(),
+        )
+        assert status == 200, content
+        assert User.objects.filter(username='asgi').exists()
+
+    def test_read_requests_use_read_pool(self):
+        from api_yamdb.asgi import is_read_request
+
+        assert is_read_request(
+            {'method': 'GET', 'path': '/api/v1/titles/1/reviews/'})
+        assert not is_read_request(
+            {'method': 'POST', 'path': '/api/v1/titles/1/reviews/'})
+        assert not is_read_request({'method': 'GET', 'path': '/api/v1/users/'})
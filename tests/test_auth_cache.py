@@ -0,0 +1,91 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _user_selects(context):
+    return [
+        query for query in context.captured_queries
+        if 'FROM "users_user"' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+
+    def test_user_is_cached_between_requests(self, user_client):
+        # /users/me/ читает профиль из базы, аутентификация проверяется на
+        # списке произведений.
+        assert user_client.get('/api/v1/titles/').status_code == 200
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        assert not _user_selects(context), (
+            'Проверьте, что пользователь берется из кеша'
+        )
+
+    def test_me_patch_invalidates_cache(self, user_client):
+        user_client.get('/api/v1/users/me/')
+        response = user_client.patch('/api/v1/users/me/', {'bio': 'Новое'})
+        assert response.status_code == 200
+        assert user_client.get('/api/v1/users/me/').json()['bio'] == 'Новое'
+
+    def test_role_change_invalidates_cache(self, user, user_client,
+                                           admin_client):
+        assert user_client.get('/api/v1/users/').status_code == 403
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', {'role': 'admin'})
+        assert response.status_code == 200
+        assert user_client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что смена роли сбрасывает кеш пользователя'
+        )
+
+    def test_deleted_user_is_rejected(self, user, user_client, admin_client):
+        user_client.get('/api/v1/users/me/')
+        response = admin_client.delete(f'/api/v1/users/{user.username}/')
+        assert response.status_code == 204
+        assert user_client.get('/api/v1/users/me/').status_code == 401
+
+    def test_stale_role_claim_reloads_user(self, user, user_client):
+        from rest_framework.test import APIClient
+        from rest_framework_simplejwt.tokens import AccessToken
+        from users.authentication import add_role_claims
+
+        user_client.get('/api/v1/users/me/')
+        user.role = 'admin'
+        type(user).objects.filter(pk=user.pk).update(role='admin')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            add_role_claims(AccessToken.for_user(user), user)))
+        assert client.get('/api/v1/users/').status_code == 200, (
+            'Проверьте, что роль из токена сверяется с кешем'
+        )
+
+    def test_cache_holds_only_auth_fields(self, user, user_client):
+        from django.core.cache import cache
+        from users.authentication import CACHED_FIELDS, user_cache_key
+
+        user_client.get('/api/v1/users/me/')
+        values = cache.get(user_cache_key(user.pk))
+        assert len(values) == len(CACHED_FIELDS)
+        assert user.password not in values, (
+            'Проверьте, что хеш пароля не попадает в кеш'
+        )
+        response = user_client.get('/api/v1/users/me/')
+        assert response.json()['email'] == user.email, (
+            'Проверьте, что остальные поля догружаются из базы'
+        )
+
+    def test_no_cache_without_shared_backend(self, user, user_client,
+                                             settings):
+        from django.core.cache import cache
+        from users.authentication import user_cache_key
+
+        settings.CACHE_SHARED = False
+        user_client.get('/api/v1/users/me/')
+        assert cache.get(user_cache_key(user.pk)) is None, (
+            'Проверьте, что без общего кеша пользователь не кешируется'
+        )
+        with CaptureQueriesContext(connection) as context:
+            user_client.get('/api/v1/titles/')
+        assert _user_selects(context)
@@ -0,0 +1,206 @@
+import json
+
+import pytest
+
+TITLES_URL = '/api/v1/bulk/titles/'
+GENRES_URL = '/api/v1/bulk/genres/'
+REVIEWS_URL = '/api/v1/bulk/reviews/'
+
+
+def statuses(response):
+    return [item['status'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db
+class TestBulkTitles:
+
+    def test_admin_only(self, user_client):
+        from rest_framework.test import APIClient
+
+        assert APIClient().post(TITLES_URL, [], format='json').status_code == 401
+        response = user_client.post(TITLES_URL, [], format='json')
+        assert response.status_code == 403, (
+            'Проверьте, что массовая запись доступна только администратору'
+        )
+
+    def test_create(self, admin_client, categories, genres):
+        from reviews.models import GenreTitle, Title
+
+        response = admin_client.post(TITLES_URL, [
+            {'name': 'Новое', 'year': 2000, 'category': 'category-0',
+             'genre': ['genre-0', 'genre-1']},
+            {'id': 500, 'name': 'С id', 'year': 2001,
+             'category': 'category-1', 'genre': ['genre-2']},
+            {'name': 'Нет категории', 'year': 2000, 'category': 'missing',
+             'genre': ['genre-0', 'missing']},
+            {'name': 'Без года', 'category': 'category-0', 'genre': []},
+        ], format='json')
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert statuses(response) == ['created', 'created', 'error', 'error']
+        assert results[1]['id'] == 500
+        assert set(results[2]['errors']) == {'category', 'genre'}
+        assert 'year' in results[3]['errors']
+        title = Title.objects.get(id=results[0]['id'])
+        assert title.category == categories[0]
+        assert set(title.genre.all()) == set(genres[:2])
+        assert GenreTitle.objects.filter(title_id=500).count() == 1
+        assert Title.objects.count() == 2, (
+            'Проверьте, что объекты с ошибками не сохраняются'
+        )
+        assert admin_client.post(TITLES_URL, [
+            {'name': 'После', 'year': 2002, 'category': 'category-0',
+             'genre': []},
+        ], format='json').json()['results'][0]['status'] == 'created', (
+            'Проверьте, что после вставки с явным id sequence сдвигается'
+        )
+
+    def test_create_existing_id(self, admin_client, titles):
+        response = admin_client.post(TITLES_URL, [
+            {'id': titles[0].id, 'name': 'Дубль', 'year': 2000,
+             'category': 'category-0', 'genre': []},
+        ], format='json')
+        assert statuses(response) == ['error']
+        titles[0].refresh_from_db()
+        assert titles[0].name == 'Произведение 0'
+
+    def test_upsert(self, admin_client, titles, genres):
+        title = titles[2]
+        response = admin_client.put(TITLES_URL, [
+            {'id': title.id, 'name': 'Обновлено', 'year': 2010,
+             'category': 'category-1', 'genre': ['genre-0']},
+            {'name': 'Новое', 'year': 2011, 'category': 'category-1',
+             'genre': ['genre-1']},
+            {'id': title.id, 'name': 'Повтор', 'year': 2010,
+             'category': 'category-1', 'genre': []},
+        ], format='json')
+        assert statuses(response) == ['updated', 'created', 'error']
+        title.refresh_from_db()
+        assert (title.name, title.year, title.category.slug) == (
+            'Обновлено', 2010, 'category-1')
+        assert list(title.genre.all()) == [genres[0]], (
+            'Проверьте, что при обновлении жанры заменяются целиком'
+        )
+
+    def test_queries_do_not_grow(
+            self, admin_client, categories, genres,
+            django_assert_max_num_queries):
+        items = [
+            {'id': 1000 + i, 'name': f'Пакет {i}', 'year': 2000,
+             'category': 'category-0', 'genre': ['genre-0', 'genre-1']}
+            for i in range(50)
+        ]
+        with django_assert_max_num_queries(15):
+            response = admin_client.post(TITLES_URL, items, format='json')
+        assert statuses(response) == ['created'] * 50
+
+    def test_ndjson(self, admin_client, categories, genres):
+        body = '\n'.join(json.dumps(item) for item in (
+            {'name': 'Первое', 'year': 2000, 'category': 'category-0',
+             'genre': ['genre-0']},
+            {'name': 'Второе', 'year': 2001, 'category': 'category-0',
+             'genre': []},
+        )) + '\n'
+        response = admin_client.post(
+            TITLES_URL, body, content_type='application/x-ndjson')
+        assert response.status_code == 200
+        assert statuses(response) == ['created', 'created']
+        response = admin_client.post(
+            TITLES_URL, '{"name": "a"}\n{oops\n',
+            content_type='application/x-ndjson')
+        assert response.status_code == 400
+        assert response.json()['detail'].startswith('Строка 2')
+
+    def test_not_a_list(self, admin_client, settings):
+        response = admin_client.post(TITLES_URL, {'name': 'a'}, format='json')
+        assert response.status_code == 400
+        settings.BULK_MAX_ITEMS = 1
+        response = admin_client.post(TITLES_URL, [{}, {}], format='json')
+        assert response.status_code == 400
+
+    def test_delete(self, admin_client, titles):
+        from reviews.models import Title
+
+        response = admin_client.delete(
+            TITLES_URL, [titles[0].id, {'id': titles[1].id}, 999999, True],
+            format='json')
+        assert statuses(response) == [
+            'deleted', 'deleted', 'not_found', 'not_found']
+        assert not Title.objects.filter(
+            id__in=[titles[0].id, titles[1].id]).exists()
+
+
+@pytest.mark.django_db
+class TestBulkGenres:
+
+    def test_create_and_upsert(self, admin_client, genres):
+        from reviews.models import Genre
+
+        response = admin_client.post(GENRES_URL, [
+            {'name': 'Новый', 'slug': 'new'},
+            {'name': 'Дубль', 'slug': 'genre-0'},
+            {'name': 'Плохой', 'slug': 'bad slug'},
+        ], format='json')
+        assert statuses(response) == ['created', 'error', 'error']
+        response = admin_client.put(GENRES_URL, [
+            {'name': 'Переименован', 'slug': 'genre-0'},
+            {'name': 'Еще', 'slug': 'more'},
+        ], format='json')
+        assert statuses(response) == ['updated', 'created']
+        assert Genre.objects.get(slug='genre-0').name == 'Переименован'
+        response = admin_client.delete(
+            GENRES_URL, ['new', 'missing'], format='json')
+        assert statuses(response) == ['deleted', 'not_found']
+
+
+@pytest.mark.django_db
+class TestBulkReviews:
+
+    def test_create_updates_rating(self, admin_client, titles, user, admin):
+        from reviews.models import Review
+
+        title = titles[10]
+        response = admin_client.post(REVIEWS_URL, [
+            {'title': title.id, 'author': user.username, 'text': 'А',
+             'score': 4},
+            {'title': title.id, 'author': admin.username, 'text': 'Б',
+             'score': 8},
+            {'title': title.id, 'author': 'nobody', 'text': 'В',
+             'score': 5},
+            {'title': title.id, 'author': user.username, 'text': 'Г',
+             'score': 5},
+        ], format='json')
+        assert statuses(response) == ['created', 'created', 'error', 'error']
+        results = response.json()['results']
+        assert 'non_field_errors' in results[3]['errors'], (
+            'Проверьте, что повтор пары title и author - общая ошибка объекта'
+        )
+        assert Review.objects.get(id=results[0]['id']).author == user
+        title.refresh_from_db()
+        assert (title.reviews_count, title.rating) == (2, 6), (
+            'Проверьте, что массовая запись отзывов пересчитывает рейтинг'
+        )
+        response = admin_client.post(REVIEWS_URL, [
+            {'title': title.id, 'author': user.username, 'text': 'Д',
+             'score': 5},
+        ], format='json')
+        assert statuses(response) == ['error']
+
+    def test_upsert_and_delete(self, admin_client, reviews):
+        review = reviews[0]
+        response = admin_client.put(REVIEWS_URL, [
+            {'title': review.title_id, 'author': review.author.username,
+             'text': 'Новый текст', 'score': 10},
+        ], format='json')
+        assert response.json()['results'] == [
+            {'index': 0, 'status': 'updated', 'id': review.id}]
+        review.refresh_from_db()
+        assert (review.text, review.score) == ('Новый текст', 10)
+        title = review.title
+        assert title.rating == pytest.approx(
+            sum(r.score for r in title.reviews.all()) / 3)
+        response = admin_client.delete(
+            REVIEWS_URL, [review.id], format='json')
+        assert statuses(response) == ['deleted']
+        title.refresh_from_db()
+        assert title.reviews_count == 2
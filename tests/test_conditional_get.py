@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+
+def modified_earlier(seconds=10):
+    """Сдвигает время последних изменений моделей в прошлое."""
+    from api.cache import MODIFIED_KEY, model_key
+    from api.signals import CACHED_MODELS
+    from django.core.cache import cache
+
+    cache.set_many({
+        MODIFIED_KEY.format(model_key(model)): time.time() - seconds
+        for model in CACHED_MODELS
+    }, None)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    @pytest.mark.parametrize('url', [
+        '/api/v1/titles/',
+        '/api/v1/categories/',
+        '/api/v1/genres/',
+    ])
+    def test_not_modified(self, client, titles, url,
+                          django_assert_num_queries):
+        modified_earlier()
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.has_header('ETag')
+        assert response.has_header('Last-Modified')
+        with django_assert_num_queries(0):
+            response = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag'])
+        assert response.status_code == 304, (
+            'Проверьте, что совпадающий If-None-Match возвращает 304'
+        )
+
+    def test_reviews_and_comments(self, client, titles, reviews):
+        from reviews.models import Comment
+
+        review = reviews[0]
+        Comment.objects.create(
+            review=review, author=review.author, text='Комментарий')
+        for url in (
+            f'/api/v1/titles/{review.title_id}/reviews/',
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}/',
+            f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+            '/comments/',
+        ):
+            etag = client.get(url)['ETag']
+            assert client.get(
+                url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    def test_if_modified_since(self, client, titles):
+        modified_earlier()
+        response = client.get('/api/v1/titles/')
+        response = client.get(
+            '/api/v1/titles/',
+            HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        assert response.status_code == 304
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_write_changes_etag(self, client, titles, user_client):
+        url = f'/api/v1/titles/{titles[0].id}/reviews/'
+        etag = client.get(url)['ETag']
+        user_client.post(url, {'text': 'Отзыв', 'score': 5})
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200, (
+            'Проверьте, что после изменения данных меняется ETag'
+        )
+        assert len(response.json()['results']) == 1
+
+    def test_etag_depends_on_query(self, client, titles):
+        etag = client.get('/api/v1/titles/')['ETag']
+        response = client.get(
+            '/api/v1/titles/', {'page': 2}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+
+    def test_no_last_modified_in_same_second(self, client, titles):
+        from api.cache import bump_versions
+        from reviews.models import Title
+
+        bump_versions(Title)
+        response = client.get('/api/v1/titles/')
+        assert response.has_header('ETag')
+        assert not response.has_header('Last-Modified'), (
+            'Проверьте, что Last-Modified не отдается, пока не прошла '
+            'секунда изменения'
+        )
+
+    def test_versions_are_counters(self, titles):
+        from api.cache import bump_versions, get_versions
+        from reviews.models import Title
+
+        before, = get_versions((Title,))
+        bump_versions(Title)
+        bump_versions(Title)
+        assert get_versions((Title,)) == (before + 2,), (
+            'Проверьте, что версия - счетчик в общем кеше'
+        )
+
+    def test_disabled_without_shared_cache(self, client, titles, settings):
+        settings.CACHE_SHARED = False
+        response = client.get('/api/v1/titles/')
+        assert not response.has_header('ETag')
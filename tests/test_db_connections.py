@@ -0,0 +1,47 @@
+class FakeConnection:
+
+    def __init__(self, usable, health_checks=True, connected=True):
+        self.connection = object() if connected else None
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.usable = usable
+        self.closed = False
+
+    def is_usable(self):
+        return self.usable
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnections(list):
+
+    def all(self):
+        return self
+
+
+def test_check_connections(monkeypatch):
+    from api import db
+
+    broken = FakeConnection(usable=False)
+    alive = FakeConnection(usable=True)
+    unchecked = FakeConnection(usable=False, health_checks=False)
+    closed = FakeConnection(usable=False, connected=False)
+    monkeypatch.setattr(
+        db, 'connections', FakeConnections([broken, alive, unchecked, closed]))
+    db.check_connections()
+    assert broken.closed, 'Проверьте, что разорванное соединение закрывается'
+    assert not alive.closed
+    assert not unchecked.closed, (
+        'Проверьте, что без CONN_HEALTH_CHECKS соединение не проверяется'
+    )
+    assert not closed.closed
+
+
+def test_health_check_on_request_started():
+    from django.core.signals import request_started
+
+    from api.db import check_connections
+
+    assert check_connections in [
+        receiver() for _, receiver in request_started.receivers
+    ]
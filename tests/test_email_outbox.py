@@ -0,0 +1,114 @@
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db
+class TestEmailOutbox:
+
+    def signup(self, client, username='newuser'):
+        return client.post('/api/v1/auth/signup/', {
+            'username': username, 'email': f'{username}@yamdb.fake'})
+
+    def test_signup_queues_email(self, client):
+        from users.models import OutgoingEmail
+
+        response = self.signup(client)
+        assert response.status_code == 200
+        assert not mail.outbox, (
+            'Проверьте, что письмо не отправляется во время запроса'
+        )
+        email = OutgoingEmail.objects.get()
+        assert email.recipient == 'newuser@yamdb.fake'
+        assert email.sent is None
+
+    def test_worker_sends_batch(self, client):
+        from users.models import OutgoingEmail
+
+        for i in range(3):
+            self.signup(client, f'newuser{i}')
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 3
+        assert not OutgoingEmail.objects.filter(sent__isnull=True).exists()
+        call_command('send_emails', '--once')
+        assert len(mail.outbox) == 3, 'Проверьте, что письма не дублируются'
+
+    def test_failed_email_is_retried_with_backoff(self, client, monkeypatch,
+                                                  settings):
+        from django.core.mail.backends.locmem import EmailBackend
+        from django.utils import timezone
+        from users.models import OutgoingEmail
+        from users.outbox import send_pending
+
+        def fail(*args, **kwargs):
+            raise ConnectionError('SMTP недоступен')
+
+        settings.EMAIL_OUTBOX_MAX_ATTEMPTS = 2
+        self.signup(client)
+        monkeypatch.setattr(EmailBackend, 'send_messages', fail)
+        assert send_pending() == 0
+        email = OutgoingEmail.objects.get()
+        assert email.attempts == 1
+        assert email.send_after > timezone.now()
+        assert 'SMTP' in email.last_error
+
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        send_pending()
+        OutgoingEmail.objects.update(send_after=timezone.now())
+        monkeypatch.undo()
+        assert send_pending() == 0, (
+            'Проверьте, что после MAX_ATTEMPTS письмо больше не отправляется'
+        )
+
+    def test_sent_outside_transaction(self, client, monkeypatch):
+        from django.core.mail.backends.locmem import EmailBackend
+        from django.db import connection
+        from users.outbox import send_pending
+
+        depth = len(connection.savepoint_ids)
+        depths = []
+        send_messages = EmailBackend.send_messages
+
+        def record(backend, messages):
+            depths.append(len(connection.savepoint_ids))
+            return send_messages(backend, messages)
+
+        self.signup(client)
+        monkeypatch.setattr(EmailBackend, 'send_messages', record)
+        assert send_pending() == 1
+        assert depths == [depth], (
+            'Проверьте, что письма отправляются вне транзакции с блокировкой'
+        )
+
+    def test_claimed_email_is_not_taken_twice(self, client):
+        from django.utils import timezone
+        from users.outbox import claim_pending
+
+        self.signup(client)
+        now = timezone.now()
+        assert len(claim_pending(10, now)) == 1
+        assert claim_pending(10, now) == [], (
+            'Проверьте, что взятое письмо не берется другим воркером'
+        )
+
+    def test_old_emails_are_pruned(self, client, settings):
+        from datetime import timedelta
+
+        from django.utils import timezone
+        from users.models import OutgoingEmail
+        from users.outbox import prune_emails
+
+        for i in range(3):
+            self.signup(client, f'newuser{i}')
+        call_command('send_emails', '--once')
+        old = timezone.now() - timedelta(
+            seconds=settings.EMAIL_OUTBOX_RETENTION + 1)
+        first, second, third = OutgoingEmail.objects.all()
+        OutgoingEmail.objects.filter(pk=first.pk).update(sent=old)
+        OutgoingEmail.objects.filter(pk=second.pk).update(
+            sent=None, created=old,
+            attempts=settings.EMAIL_OUTBOX_MAX_ATTEMPTS)
+        assert prune_emails() == 2
+        assert list(OutgoingEmail.objects.all()) == [third], (
+            'Проверьте, что старые письма с кодами удаляются'
+        )
@@ -0,0 +1,94 @@
+import csv
+import io
+import json
+
+import pytest
+
+TITLES_URL = '/api/v1/export/titles/'
+REVIEWS_URL = '/api/v1/export/reviews/'
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExport:
+
+    def test_admin_only(self, user_client):
+        from rest_framework.test import APIClient
+
+        assert APIClient().get(TITLES_URL).status_code == 401
+        assert user_client.get(TITLES_URL).status_code == 403, (
+            'Проверьте, что выгрузка доступна только администратору'
+        )
+
+    def test_titles_ndjson(self, admin_client, reviews):
+        response = admin_client.get(TITLES_URL)
+        assert response.status_code == 200
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдается StreamingHttpResponse'
+        )
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        rows = [json.loads(line) for line in content(response).splitlines()]
+        assert len(rows) == 15
+        assert rows[0] == {
+            'id': reviews[0].title.id, 'name': 'Произведение 0',
+            'year': 1990, 'category': reviews[0].title.category_id,
+            'description': '', 'rating': 2.0,
+        }
+
+    def test_reviews_csv_loads_back(self, admin_client, reviews, settings):
+        from reviews.management.commands.load_csv_data import \
+            resolve_columns
+        from django.utils.dateparse import parse_datetime
+        from reviews.models import Review
+
+        settings.EXPORT_CHUNK_SIZE = 2
+        response = admin_client.get(REVIEWS_URL, {'output': 'csv'})
+        assert response['Content-Type'].startswith('text/csv')
+        assert 'review.csv' in response['Content-Disposition']
+        reader = csv.reader(io.StringIO(content(response)))
+        header = next(reader)
+        assert header == [
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date']
+        resolve_columns(Review, header)
+        rows = list(reader)
+        assert len(rows) == len(reviews)
+        first = reviews[0]
+        assert rows[0][:5] == [str(first.id), str(first.title_id), 'Отзыв',
+                               str(first.author_id), str(first.score)]
+        assert parse_datetime(rows[0][5]) == first.pub_date
+
+    def test_titles_csv_without_rating(self, admin_client, titles):
+        response = admin_client.get(TITLES_URL, {'output': 'csv'})
+        assert 'titles.csv' in response['Content-Disposition'], (
+            'Проверьте, что имя файла совпадает с DATA_MODEL load_csv_data'
+        )
+        header = next(csv.reader(io.StringIO(content(response))))
+        assert header == ['id', 'name', 'year', 'category', 'description'], (
+            'Проверьте, что в CSV нет рейтинга без числа отзывов'
+        )
+
+    def test_file_names_match_loader(self):
+        from api.export import ReviewExportView, TitleExportView
+        from reviews.management.commands.load_csv_data import DATA_MODEL
+
+        for view in (TitleExportView, ReviewExportView):
+            assert DATA_MODEL[view.file_name] is view.model
+
+    def test_rows_read_while_streaming(self, admin_client, titles):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(TITLES_URL, {'output': 'csv'})
+        assert not any(
+            'reviews_title' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что строки читаются при отдаче ответа, а не во view'
+        assert len(content(response).splitlines()) == 16
+
+    def test_unknown_output(self, admin_client):
+        response = admin_client.get(TITLES_URL, {'output': 'xml'})
+        assert response.status_code == 400
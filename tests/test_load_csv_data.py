@@ -0,0 +1,55 @@
+import pytest
+from django.core.management import CommandError, call_command
+
+
+@pytest.mark.django_db
+class TestLoadCsvData:
+
+    def test_load_csv_data(self):
+        from reviews.models import Comment, GenreTitle, Review, Title, User
+
+        call_command('load_csv_data', '--noinput', '--batch-size', '7')
+        assert User.objects.count() == 5
+        assert Title.objects.count() == 32
+        assert Review.objects.count() == 72
+        assert Comment.objects.count() == 3
+        assert GenreTitle.objects.count() == 42
+        review = Review.objects.get(pk=1)
+        assert review.pub_date.year == 2019, (
+            'Проверьте, что дата публикации берется из CSV'
+        )
+        title = Title.objects.get(pk=review.title_id)
+        assert title.reviews_count == title.reviews.count(), (
+            'Проверьте, что после загрузки пересчитывается рейтинг'
+        )
+
+    def test_noinput_requires_truncate(self):
+        call_command('load_csv_data', '--noinput')
+        with pytest.raises(CommandError):
+            call_command('load_csv_data', '--noinput')
+        call_command('load_csv_data', '--noinput', '--truncate')
+
+    @pytest.mark.parametrize('title_id', ['', 'abc'])
+    def test_bad_foreign_key(self, title_id):
+        from reviews.management.commands.load_csv_data import (
+            build_objects, resolve_columns)
+        from reviews.models import Review
+
+        columns = resolve_columns(Review, ['id', 'title_id', 'text'])
+        rows = [{'id': '1', 'title_id': title_id, 'text': 'Отзыв'}]
+        with pytest.raises(CommandError, match='Запись 5: title_id'):
+            build_objects(Review, columns, {'title_id': set()}, rows, 5)
+
+    def test_dependency_levels(self):
+        from reviews.management.commands.load_csv_data import (
+            DATA_MODEL, dependency_levels)
+        from reviews.models import (Category, Comment, Genre, GenreTitle,
+                                    Review, Title, User)
+
+        levels = dependency_levels(list(reversed(DATA_MODEL.values())))
+        assert [set(level) for level in levels] == [
+            {User, Category, Genre},
+            {Title},
+            {GenreTitle, Review},
+            {Comment},
+        ], 'Проверьте порядок загрузки моделей по внешним ключам'
@@ -0,0 +1,66 @@
+import pytest
+
+
+def sample(name, **labels):
+    from prometheus_client import REGISTRY
+
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class TestMetrics:
+
+    def test_request_metrics(self, client, titles):
+        before = sample('yamdb_request_duration_seconds_count',
+                        route='titles-list', method='GET')
+        client.get('/api/v1/titles/')
+        client.get('/api/v1/titles/')
+        assert sample('yamdb_request_duration_seconds_count',
+                      route='titles-list', method='GET') == before + 2
+        assert sample('yamdb_response_cache_total', result='hit') > 0
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        content = response.content.decode()
+        for metric in ('yamdb_request_duration_seconds_bucket',
+                       'yamdb_requests_in_flight', 'yamdb_db_queries_total'):
+            assert metric in content, f'Проверьте, что /metrics отдает {metric}'
+
+    def test_connection_metrics(self):
+        from api.metrics import connection_opened, connections_closed
+
+        class Wrapper:
+            alias = 'metrics'
+            connection = object()
+
+        created = sample('yamdb_db_connections_created_total',
+                         alias='metrics')
+        opened = sample('yamdb_db_connections_open', alias='metrics')
+        wrapper = Wrapper()
+        connection_opened(sender=None, connection=wrapper)
+        connections_closed()
+        assert sample('yamdb_db_connections_created_total',
+                      alias='metrics') == created + 1
+        assert sample('yamdb_db_connections_open',
+                      alias='metrics') == opened + 1
+        wrapper.connection = None
+        connections_closed()
+        assert sample('yamdb_db_connections_open',
+                      alias='metrics') == opened, (
+            'Проверьте, что закрытое соединение вычитается из открытых'
+        )
+
+    def test_auth_counters(self, client):
+        from django.contrib.auth.tokens import default_token_generator
+        from users.models import User
+
+        signups = sample('yamdb_signups_total', created='True')
+        tokens = sample('yamdb_tokens_issued_total')
+        client.post('/api/v1/auth/signup/', {
+            'username': 'newuser', 'email': 'newuser@yamdb.fake'})
+        user = User.objects.get(username='newuser')
+        client.post('/api/v1/auth/token/', {
+            'username': 'newuser',
+            'confirmation_code': default_token_generator.make_token(user),
+        })
+        assert sample('yamdb_signups_total', created='True') == signups + 1
+        assert sample('yamdb_tokens_issued_total') == tokens + 1
@@ -0,0 +1,143 @@
+import pytest
+
+
+@pytest.fixture
+def many_reviews(titles, django_user_model):
+    from reviews.models import Review
+
+    title = titles[0]
+    for i in range(25):
+        author = django_user_model.objects.create_user(
+            username=f'reader{i}', email=f'reader{i}@yamdb.fake')
+        Review.objects.create(
+            title=title, author=author, text=f'Отзыв {i}', score=5)
+    return title
+
+
+@pytest.mark.django_db
+class TestReviewPagination:
+
+    def test_page_number_is_default(self, client, many_reviews):
+        data = client.get(
+            f'/api/v1/titles/{many_reviews.id}/reviews/').json()
+        assert data['count'] == 25, (
+            'Проверьте, что постраничная пагинация осталась по умолчанию'
+        )
+
+    def test_cursor_pagination(self, client, many_reviews):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        url = f'/api/v1/titles/{many_reviews.id}/reviews/?pagination=cursor'
+        seen = []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                data = client.get(url).json()
+                assert 'count' not in data
+                seen.extend(review['id'] for review in data['results'])
+                url = data['next']
+        assert len(seen) == 25 and len(set(seen)) == 25, (
+            'Проверьте, что курсор проходит все отзывы без повторов'
+        )
+        assert not [
+            query for query in context.captured_queries
+            if 'COUNT(' in query['sql'] or 'OFFSET' in query['sql']
+        ], 'Проверьте, что курсорная пагинация не делает COUNT и OFFSET'
+
+    @pytest.mark.parametrize('fast', [True, False])
+    def test_cursor_same_pub_date(self, client, many_reviews, settings, fast):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from reviews.models import Review
+
+        settings.FAST_READ_SERIALIZERS = fast
+        Review.objects.update(pub_date=Review.objects.first().pub_date)
+        url = f'/api/v1/titles/{many_reviews.id}/reviews/?pagination=cursor'
+        pages = []
+        with CaptureQueriesContext(connection) as context:
+            while url:
+                data = client.get(url).json()
+                pages.append([review['id'] for review in data['results']])
+                url = data['next']
+            back = []
+            url = data['previous']
+            while url:
+                data = client.get(url).json()
+                back.insert(0, [review['id'] for review in data['results']])
+                url = data['previous']
+        seen = [pk for page in pages for pk in page]
+        assert seen == sorted(seen) and len(set(seen)) == 25, (
+            'Проверьте, что отзывы с одной pub_date проходятся по id'
+        )
+        assert back == pages[:-1]
+        assert not [
+            query for query in context.captured_queries
+            if 'OFFSET' in query['sql']
+        ], 'Проверьте, что одинаковые pub_date не дают OFFSET'
+
+    def test_invalid_cursor(self, client, many_reviews):
+        from base64 import b64encode
+
+        cursor = b64encode(b'p=broken').decode()
+        response = client.get(
+            f'/api/v1/titles/{many_reviews.id}/reviews/',
+            {'pagination': 'cursor', 'cursor': cursor})
+        assert response.status_code == 404
+
+
+def _counts(context):
+    return [
+        query for query in context.captured_queries
+        if query['sql'].startswith('SELECT COUNT(')
+    ]
+
+
+@pytest.mark.django_db
+class TestTitleCountPagination:
+
+    def test_count_is_cached(self, user_client, titles, categories):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        params = {'category': categories[0].slug}
+        user_client.get('/api/v1/titles/', params)
+        with CaptureQueriesContext(connection) as context:
+            data = user_client.get('/api/v1/titles/', params).json()
+        assert data['count'] == 8
+        assert not _counts(context), (
+            'Проверьте, что COUNT для одинаковых фильтров кешируется'
+        )
+
+    def test_count_not_cached_without_shared_cache(
+            self, user_client, titles, settings):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        settings.CACHE_SHARED = False
+        user_client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            user_client.get('/api/v1/titles/')
+        assert _counts(context), (
+            'Проверьте, что без общего кеша COUNT не кешируется'
+        )
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_count_invalidated_on_write(self, user_client, titles,
+                                        categories):
+        from reviews.models import Title
+
+        assert user_client.get('/api/v1/titles/').json()['count'] == 15
+        Title.objects.create(name='Новое', year=2000, category=categories[0])
+        assert user_client.get('/api/v1/titles/').json()['count'] == 16
+
+    def test_capped_count(self, user_client, titles, monkeypatch):
+        from api.views import TitleViewSet
+
+        monkeypatch.setattr(TitleViewSet, 'count_mode', 'capped',
+                            raising=False)
+        monkeypatch.setattr(TitleViewSet, 'count_cap', 12, raising=False)
+        data = user_client.get('/api/v1/titles/').json()
+        assert data['count'] == '12+'
+        assert data['next'], 'Проверьте, что вторая страница доступна'
+        assert user_client.get(data['next']).status_code == 200
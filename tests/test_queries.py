@@ -0,0 +1,113 @@
+import pytest
+
+
+@pytest.fixture(params=[True, False], ids=['values', 'serializer'])
+def fast_read(request, settings):
+    settings.FAST_READ_SERIALIZERS = request.param
+
+
+@pytest.mark.django_db
+class TestTitleQueries:
+    # COUNT для пагинации, страница произведений и prefetch жанров.
+    LIST_QUERIES = 3
+    # Произведение вместе с категорией и prefetch жанров.
+    DETAIL_QUERIES = 2
+
+    def test_titles_list(self, fast_read, client, titles, reviews,
+                         django_assert_num_queries):
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data['results']) == 10, (
+            'Проверьте, что список произведений пагинируется'
+        )
+        assert data['results'][0]['category']['slug'], (
+            'Проверьте, что в списке произведений выводится категория'
+        )
+
+    def test_titles_list_page_size_independent(
+            self, fast_read, client, titles, django_assert_num_queries,
+            settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK, 'PAGE_SIZE': 100
+        }
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get('/api/v1/titles/')
+        assert response.status_code == 200
+
+    def test_titles_retrieve(self, fast_read, client, titles, reviews,
+                             django_assert_num_queries):
+        with django_assert_num_queries(self.DETAIL_QUERIES):
+            response = client.get(f'/api/v1/titles/{titles[2].id}/')
+        assert response.status_code == 200
+        assert len(response.json()['genre']) == 3, (
+            'Проверьте, что у произведения выводятся все жанры'
+        )
+
+    def test_titles_filtered_list(self, fast_read, client, titles, genres,
+                                  categories, django_assert_num_queries):
+        params = {'genre': genres[2].slug, 'category': categories[0].slug}
+        # Slug жанра и категории переводятся в id один раз и кешируются.
+        with django_assert_num_queries(self.LIST_QUERIES + 2):
+            response = client.get('/api/v1/titles/', params)
+        assert response.status_code == 200
+        for title in response.json()['results']:
+            assert title['category']['slug'] == categories[0].slug
+        # Повторно slug и COUNT берутся из кеша.
+        with django_assert_num_queries(self.LIST_QUERIES - 1):
+            client.get('/api/v1/titles/', {**params, 'ordering': 'year'})
+
+
+@pytest.mark.django_db
+class TestNestedListQueries:
+    # COUNT для пагинации и страница вместе с автором, без запроса родителя.
+    LIST_QUERIES = 2
+
+    def test_reviews_list(self, fast_read, client, reviews,
+                          django_assert_num_queries):
+        url = f'/api/v1/titles/{reviews[0].title_id}/reviews/'
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3
+        assert response.json()['results'][0]['author'] == 'author0'
+
+    def test_comments_list(self, fast_read, client, review_comments,
+                           django_assert_num_queries):
+        review = review_comments[0].review
+        url = (f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+               '/comments/')
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(url)
+        assert response.status_code == 200
+        assert len(response.json()['results']) == 3, (
+            'Проверьте, что автор комментария загружается тем же запросом'
+        )
+
+    def test_empty_list_probes_parent(self, fast_read, client, titles,
+                                      reviews, django_assert_num_queries):
+        # Пустая страница: COUNT и exists() для родителя.
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(f'/api/v1/titles/{titles[10].id}/reviews/')
+        assert response.status_code == 200
+        assert response.json()['results'] == []
+        review = reviews[0]
+        with django_assert_num_queries(self.LIST_QUERIES):
+            response = client.get(
+                f'/api/v1/titles/{review.title_id}/reviews/{review.id}'
+                '/comments/')
+        assert response.status_code == 200
+
+    def test_missing_parent(self, fast_read, client, titles, reviews):
+        review = reviews[0]
+        urls = (
+            '/api/v1/titles/0/reviews/',
+            f'/api/v1/titles/{review.title_id}/reviews/0/comments/',
+            f'/api/v1/titles/{titles[10].id}/reviews/{review.id}/comments/',
+            '/api/v1/titles/0/reviews/?pagination=cursor',
+        )
+        for url in urls:
+            assert client.get(url).status_code == 404, (
+                f'Проверьте, что {url} отвечает 404'
+            )
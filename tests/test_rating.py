@@ -0,0 +1,79 @@
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg
+
+
+def _stored(title):
+    title.refresh_from_db()
+    return title.rating, title.reviews_count, title.score_sum
+
+
+@pytest.mark.django_db
+class TestTitleRating:
+
+    def test_rating_follows_review_api(self, user_client, titles):
+        title = titles[0]
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 4})
+        assert response.status_code == 201
+        assert _stored(title) == (4.0, 1, 4), (
+            'Проверьте, что рейтинг обновляется при создании отзыва'
+        )
+
+        review_url = f'{url}{response.json()["id"]}/'
+        response = user_client.patch(review_url, {'score': 9})
+        assert response.status_code == 200
+        assert _stored(title) == (9.0, 1, 9), (
+            'Проверьте, что рейтинг обновляется при изменении оценки'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == 204
+        assert _stored(title) == (None, 0, 0), (
+            'Проверьте, что рейтинг сбрасывается при удалении отзыва'
+        )
+
+    def test_rating_matches_aggregate(self, client, titles, reviews):
+        from reviews.models import Title
+
+        response = client.get(f'/api/v1/titles/{titles[1].id}/')
+        expected = Title.objects.filter(pk=titles[1].pk).aggregate(
+            rating=Avg('reviews__score'))['rating']
+        assert response.json()['rating'] == pytest.approx(expected)
+
+    def test_live_aggregate_mode(self, client, titles, reviews, settings):
+        from reviews.models import Title
+
+        settings.RATING_LIVE_AGGREGATE = True
+        Title.objects.filter(pk=titles[1].pk).update(rating=0)
+        response = client.get(f'/api/v1/titles/{titles[1].id}/')
+        assert response.json()['rating'] != 0, (
+            'Проверьте, что RATING_LIVE_AGGREGATE считает рейтинг по отзывам'
+        )
+
+    def test_rating_only_drift(self, titles, reviews):
+        from reviews.models import Title
+        from reviews.ratings import drifted_titles
+
+        assert not drifted_titles(Title.objects.all()).exists()
+        Title.objects.filter(pk=titles[0].pk).update(rating=9.5)
+        Title.objects.filter(pk=titles[-1].pk).update(rating=3)
+        assert set(drifted_titles(Title.objects.all())) == {
+            titles[0], titles[-1]}, (
+            'Проверьте, что находится рейтинг, разошедшийся при верных '
+            'числе отзывов и сумме оценок'
+        )
+        call_command('recalculate_ratings')
+        assert not drifted_titles(Title.objects.all()).exists()
+        assert _stored(titles[-1]) == (None, 0, 0)
+
+    def test_recalculate_ratings_repairs_drift(self, titles, reviews):
+        from reviews.models import Title
+
+        Title.objects.update(rating=None, reviews_count=0, score_sum=0)
+        call_command('recalculate_ratings')
+        for title in titles[:5]:
+            rating, count, total = _stored(title)
+            assert count == 3
+            assert rating == pytest.approx(total / count)
+        assert _stored(titles[-1]) == (None, 0, 0)
@@ -0,0 +1,56 @@
+import pytest
+
+
+def fetch(client, settings, url, fast):
+    settings.FAST_READ_SERIALIZERS = fast
+    response = client.get(url)
+    assert response.status_code == 200, url
+    return response.content
+
+
+@pytest.mark.django_db
+class TestReadSerializersContract:
+
+    def urls(self, titles, reviews, comments):
+        title = reviews[0].title_id
+        review = reviews[0].id
+        return [
+            '/api/v1/titles/',
+            '/api/v1/titles/?page=2',
+            '/api/v1/titles/?genre=genre-1&year=1992',
+            '/api/v1/titles/?search=Произведение 1',
+            f'/api/v1/titles/{titles[4].id}/',
+            f'/api/v1/titles/{titles[14].id}/',
+            f'/api/v1/titles/{title}/reviews/',
+            f'/api/v1/titles/{title}/reviews/?pagination=cursor',
+            f'/api/v1/titles/{title}/reviews/{review}/',
+            f'/api/v1/titles/{title}/reviews/{review}/comments/',
+            f'/api/v1/titles/{title}/reviews/{review}/comments/'
+            '?pagination=cursor',
+            f'/api/v1/titles/{title}/reviews/{review}/comments/'
+            f'{comments[0].id}/',
+        ]
+
+    def test_same_bytes(self, user_client, settings, titles, reviews,
+                        comments):
+        titles[3].category = None
+        titles[3].description = 'Описание'
+        titles[3].save()
+        for url in self.urls(titles, reviews, comments):
+            assert (fetch(user_client, settings, url, True)
+                    == fetch(user_client, settings, url, False)), (
+                f'Проверьте, что быстрый вывод {url} совпадает '
+                'с ModelSerializer'
+            )
+
+    def test_same_bytes_live_rating(self, user_client, settings, titles,
+                                    reviews):
+        settings.RATING_LIVE_AGGREGATE = True
+        for url in ('/api/v1/titles/', f'/api/v1/titles/{titles[0].id}/'):
+            assert (fetch(user_client, settings, url, True)
+                    == fetch(user_client, settings, url, False))
+
+    def test_not_found(self, user_client, titles, reviews):
+        response = user_client.get(
+            f'/api/v1/titles/{titles[0].id}/reviews/0/')
+        assert response.status_code == 404
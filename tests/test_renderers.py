@@ -0,0 +1,68 @@
+import datetime
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+DATA = {
+    'id': 1,
+    'name': 'Произведение   с переводом строки',
+    'rating': 4.5,
+    'price': Decimal('10.25'),
+    'created': datetime.datetime(
+        2022, 1, 2, 3, 4, 5, 678901, tzinfo=datetime.timezone.utc),
+    'naive': datetime.datetime(2022, 1, 2, 3, 4, 5),
+    'date': datetime.date(2022, 1, 2),
+    'time': datetime.time(3, 4, 5, 678901),
+    'duration': datetime.timedelta(minutes=90),
+    'genre': [{'name': 'Жанр', 'slug': 'genre'}],
+    'category': None,
+    10: 'ключ-число',
+    'big': 2 ** 70,
+}
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def renderers(request, monkeypatch):
+    from api import renderers
+
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(renderers, 'orjson', None)
+    return renderers
+
+
+def test_renderer_matches_drf(renderers):
+    for data in (DATA, [DATA, DATA], {'results': []}, None):
+        assert (renderers.FastJSONRenderer().render(data)
+                == JSONRenderer().render(data)), (
+            'Проверьте, что вывод совпадает с JSONRenderer'
+        )
+
+
+def test_renderer_indent(renderers):
+    media_type = 'application/json; indent=4'
+    assert (renderers.FastJSONRenderer().render(DATA, media_type)
+            == JSONRenderer().render(DATA, media_type))
+
+
+def test_parser_matches_drf(renderers):
+    import io
+
+    content = JSONRenderer().render({**DATA, 'big': 2 ** 70})
+    assert (renderers.FastJSONParser().parse(io.BytesIO(content))
+            == JSONParser().parse(io.BytesIO(content)))
+    for invalid in (b'{"a": NaN}', b'{"a": ', b'\xff'):
+        with pytest.raises(ParseError):
+            renderers.FastJSONParser().parse(io.BytesIO(invalid))
+
+
+@pytest.mark.django_db
+def test_api_uses_fast_renderer(admin_client):
+    response = admin_client.post(
+        '/api/v1/genres/', {'name': 'Жанр', 'slug': 'genre'}, format='json')
+    assert response.status_code == 201
+    assert response.accepted_renderer.__class__.__name__ == 'FastJSONRenderer'
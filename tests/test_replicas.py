@@ -0,0 +1,124 @@
+import pytest
+from rest_framework.test import APIClient
+
+CATEGORIES_URL = '/api/v1/categories/'
+
+
+def test_router_outside_request(settings):
+    from api.db import ReplicaRouter
+    from reviews.models import Title
+
+    settings.DATABASE_REPLICAS = ['replica']
+    router = ReplicaRouter()
+    assert router.db_for_read(Title) is None, (
+        'Проверьте, что вне запроса чтение идет в основную базу'
+    )
+    assert router.db_for_write(Title) is None
+
+
+def test_router_sticks_to_primary_after_write(settings):
+    from api.db import ReplicaRouter, replica_reads
+    from reviews.models import Title
+
+    settings.DATABASE_REPLICAS = ['replica']
+    router = ReplicaRouter()
+    with replica_reads(True):
+        assert router.db_for_read(Title) == 'replica'
+        router.db_for_write(Title)
+        assert router.db_for_read(Title) is None, (
+            'Проверьте, что после записи запрос читает из основной базы'
+        )
+    with replica_reads(False):
+        assert router.db_for_read(Title) is None
+    settings.DATABASE_REPLICAS = ['replica', 'replica_2']
+    with replica_reads(True):
+        aliases = {router.db_for_read(Title) for _ in range(20)}
+    assert len(aliases) == 1, (
+        'Проверьте, что запрос читает с одной реплики'
+    )
+    title = Title(name='a', year=2000)
+    title._state.db = 'replica'
+    assert router.db_for_write(Title, instance=title) == 'default', (
+        'Проверьте, что объект, прочитанный с реплики, пишется в default'
+    )
+
+
+def test_router_ignores_database_cache(settings):
+    from api.db import ReplicaRouter, replica_reads
+    from django.core.cache.backends.db import DatabaseCache
+
+    settings.DATABASE_REPLICAS = ['replica']
+    router = ReplicaRouter()
+    model = DatabaseCache('yamdb_cache', {}).cache_model_class
+    with replica_reads(True) as state:
+        assert router.db_for_read(model) is None, (
+            'Проверьте, что DatabaseCache читается из основной базы'
+        )
+        router.db_for_write(model)
+        assert not state.written, (
+            'Проверьте, что запись в кеш не закрепляет клиента за default'
+        )
+
+
+# Без обертки теста в транзакцию: внутри нее роутер читает из default.
+@pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+class TestReplicaRouting:
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        from reviews.models import Category
+
+        settings.DATABASE_REPLICAS = ['replica']
+        Category.objects.using('replica').create(
+            name='На реплике', slug='replica-only')
+
+    def slugs(self, response):
+        return [item['slug'] for item in response.json()['results']]
+
+    def test_get_reads_replica(self, settings):
+        settings.RESPONSE_CACHE_TIMEOUT = 0
+        response = APIClient().get(CATEGORIES_URL)
+        assert self.slugs(response) == ['replica-only'], (
+            'Проверьте, что GET запросы читают с реплики'
+        )
+        assert 'yamdb_primary' not in response.cookies
+        assert not response.has_header('ETag'), (
+            'Проверьте, что ответ с реплики не получает ETag по версиям'
+        )
+
+    def test_cached_response_read_from_primary(self, admin_client):
+        admin_client.post(
+            CATEGORIES_URL, {'name': 'Новая', 'slug': 'new'}, format='json')
+        response = APIClient().get(CATEGORIES_URL)
+        assert response['X-Cache'] == 'MISS'
+        assert self.slugs(response) == ['new'], (
+            'Проверьте, что ответ для кеша по версиям читается из default'
+        )
+        client = APIClient()
+        client.cookies['yamdb_primary'] = '1'
+        assert self.slugs(client.get(CATEGORIES_URL)) == ['new'], (
+            'Проверьте, что после записи клиент не получает ответ реплики '
+            'из кеша'
+        )
+
+    def test_write_goes_to_primary_and_pins(self, admin_client):
+        from reviews.models import Category
+
+        response = admin_client.post(
+            CATEGORIES_URL, {'name': 'Новая', 'slug': 'new'}, format='json')
+        assert response.status_code == 201
+        assert Category.objects.filter(slug='new').exists()
+        assert not Category.objects.using('replica').filter(
+            slug='new').exists()
+        assert 'yamdb_primary' in response.cookies, (
+            'Проверьте, что после записи клиент получает cookie'
+        )
+        client = APIClient()
+        client.cookies['yamdb_primary'] = '1'
+        assert self.slugs(client.get(CATEGORIES_URL)) == ['new'], (
+            'Проверьте, что после записи клиент читает из основной базы'
+        )
+
+    def test_no_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert self.slugs(APIClient().get(CATEGORIES_URL)) == []
@@ -0,0 +1,120 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+
+    def test_anonymous_titles_are_cached(self, client, titles,
+                                         django_assert_num_queries):
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'MISS'
+        with django_assert_num_queries(0):
+            response = client.get('/api/v1/titles/')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что повторный анонимный запрос берется из кеша'
+        )
+
+    def test_query_params_are_normalized(self, client, titles, genres):
+        client.get('/api/v1/titles/', {'genre': genres[0].slug, 'page': 1})
+        response = client.get(
+            f'/api/v1/titles/?page=1&genre={genres[0].slug}')
+        assert response['X-Cache'] == 'HIT'
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_write_invalidates_cache(self, client, titles, genres,
+                                     admin_client):
+        client.get('/api/v1/genres/')
+        response = admin_client.post(
+            '/api/v1/genres/', {'name': 'Новый', 'slug': 'new'})
+        assert response.status_code == 201
+        response = client.get('/api/v1/genres/')
+        assert response['X-Cache'] == 'MISS'
+        assert 'new' in [genre['slug'] for genre in response.json()['results']]
+
+        client.get(f'/api/v1/titles/{titles[0].id}/')
+        genres[0].name = 'Переименован'
+        genres[0].save()
+        response = client.get(f'/api/v1/titles/{titles[0].id}/')
+        assert response['X-Cache'] == 'MISS', (
+            'Проверьте, что изменение жанра сбрасывает кеш произведений'
+        )
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_review_invalidates_title_rating(self, client, titles,
+                                             user_client):
+        url = f'/api/v1/titles/{titles[0].id}/'
+        client.get(url)
+        user_client.post(f'{url}reviews/', {'text': 'Отзыв', 'score': 7})
+        assert client.get(url).json()['rating'] == 7
+
+    def test_authenticated_requests_bypass_cache(self, titles, user_client):
+        user_client.get('/api/v1/titles/')
+        assert 'X-Cache' not in user_client.get('/api/v1/titles/')
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_stale_while_revalidate(self, client, titles, settings):
+        from api.cache import LOCK_KEY, request_key
+        from django.core.cache import cache
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        settings.RESPONSE_CACHE_STALE = 10
+        client.get('/api/v1/titles/')
+        titles[0].save()
+        request = Request(APIRequestFactory().get('/api/v1/titles/'))
+        cache.add(LOCK_KEY.format(request_key(request)), 1)
+        assert client.get('/api/v1/titles/')['X-Cache'] == 'STALE', (
+            'Проверьте, что пока ответ пересчитывается, отдается старый'
+        )
+
+    def test_stats(self, client, titles, admin_client):
+        client.get('/api/v1/categories/')
+        client.get('/api/v1/categories/')
+        stats = admin_client.get('/api/v1/cache/stats/').json()
+        assert stats['hit'] == 1
+        assert stats['miss'] == 1
+        assert stats['hit_ratio'] == 0.5
+
+    def test_stats_one_round_trip(self, monkeypatch):
+        from api import cache as api_cache
+
+        class Recorder:
+            def __init__(self, cache):
+                self.cache = cache
+                self.calls = []
+
+            def __getattr__(self, name):
+                self.calls.append(name)
+                return getattr(self.cache, name)
+
+        recorder = Recorder(api_cache.cache)
+        monkeypatch.setattr(api_cache, 'cache', recorder)
+        api_cache.count('hit')
+        recorder.calls.clear()
+        api_cache.count('hit')
+        assert recorder.calls == ['incr'], (
+            'Проверьте, что счетчик кеша - одно обращение к кешу'
+        )
+        assert api_cache.response_cache_stats()['hit'] == 2
+
+    def test_version_bumped_after_commit(self, titles):
+        from api.cache import get_versions
+        from django.db import transaction
+        from reviews.models import Genre
+
+        before = get_versions((Genre,))
+        with transaction.atomic(savepoint=False):
+            Genre.objects.create(name='Новый', slug='new')
+            assert get_versions((Genre,)) == before, (
+                'Проверьте, что версия меняется только после коммита'
+            )
+
+    def test_disabled_without_shared_cache(self, client, titles, settings):
+        settings.CACHE_SHARED = False
+        client.get('/api/v1/titles/')
+        response = client.get('/api/v1/titles/')
+        assert 'X-Cache' not in response, (
+            'Проверьте, что с кешем одного процесса ответы не кешируются'
+        )
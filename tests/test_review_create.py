@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+from django.db import connection
+
+REVIEW = {'text': 'Отзыв', 'score': 7}
+
+
+def reviews_url(title):
+    return f'/api/v1/titles/{title.id}/reviews/'
+
+
+@pytest.mark.django_db
+class TestReviewCreate:
+
+    def test_duplicate_review(self, user_client, titles):
+        title = titles[0]
+        assert user_client.post(reviews_url(title), REVIEW).status_code == 201
+        response = user_client.post(reviews_url(title), REVIEW)
+        assert response.status_code == 400, (
+            'Проверьте, что повторный отзыв на произведение запрещен'
+        )
+        assert response.json() == {
+            'non_field_errors': ['Вы уже оставляли отзыв к этому произведению']
+        }
+        title.refresh_from_db()
+        assert title.reviews_count == 1
+        assert title.rating == 7
+
+    def test_title_loaded_once(self, user_client, titles):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        user_client.get('/api/v1/titles/')
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(reviews_url(titles[0]), REVIEW)
+        assert response.status_code == 201
+        title_selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_title"' in query['sql']
+        ]
+        assert len(title_selects) == 1, (
+            'Проверьте, что произведение загружается один раз'
+        )
+        assert not any(
+            query['sql'].startswith('SELECT')
+            and 'FROM "reviews_review"' in query['sql']
+            for query in context.captured_queries
+        ), 'Проверьте, что уникальность отзыва проверяет база'
+
+    def test_missing_title(self, user_client):
+        response = user_client.post('/api/v1/titles/0/reviews/', REVIEW)
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != 'postgresql',
+                    reason='SQLite блокирует таблицу при параллельной записи')
+def test_parallel_reviews(user, titles):
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+    from reviews.models import Review
+
+    title = titles[0]
+    token = AccessToken.for_user(user)
+    barrier = threading.Barrier(5)
+    statuses = []
+
+    def post():
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        barrier.wait()
+        statuses.append(client.post(reviews_url(title), REVIEW).status_code)
+
+    threads = [threading.Thread(target=post) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(statuses) == [201, 400, 400, 400, 400], statuses
+    assert Review.objects.filter(title=title, author=user).count() == 1
+    title.refresh_from_db()
+    assert title.reviews_count == 1
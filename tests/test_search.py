@@ -0,0 +1,62 @@
+import pytest
+from django.db import connection
+
+
+@pytest.fixture
+def named_titles(categories):
+    from reviews.models import Title
+
+    names = ('Побег из Шоушенка', 'Крестный отец', 'Крестный отец 2',
+             'Властелин колец', 'Побег')
+    return [
+        Title.objects.create(name=name, year=1990, category=categories[0])
+        for name in names
+    ]
+
+
+@pytest.mark.django_db
+class TestTitleSearch:
+
+    def test_name_filter_is_case_insensitive(self, client, named_titles):
+        data = client.get('/api/v1/titles/', {'name': 'крестный'}).json()
+        assert {title['name'] for title in data['results']} == {
+            'Крестный отец', 'Крестный отец 2'
+        }, 'Проверьте, что фильтр name не зависит от регистра'
+
+    def test_search_is_ranked(self, client, named_titles):
+        data = client.get('/api/v1/titles/', {'search': 'побег'}).json()
+        names = [title['name'] for title in data['results']]
+        assert names == ['Побег', 'Побег из Шоушенка'], (
+            'Проверьте, что ?search= сортирует по релевантности'
+        )
+
+    def test_search_tolerates_typos(self, client, named_titles):
+        data = client.get('/api/v1/titles/', {'search': 'властилин'}).json()
+        assert [title['name'] for title in data['results']] == [
+            'Властелин колец'
+        ]
+
+    # Версии сбрасываются после коммита, нужен тест без общей транзакции.
+    @pytest.mark.django_db(transaction=True)
+    def test_index_follows_writes(self, client, named_titles):
+        from reviews.models import Title
+
+        client.get('/api/v1/titles/', {'search': 'побег'})
+        Title.objects.create(name='Большой побег', year=1963)
+        data = client.get('/api/v1/titles/', {'search': 'побег'}).json()
+        assert 'Большой побег' in [title['name'] for title in data['results']]
+
+    def test_genre_search(self, client, genres):
+        data = client.get('/api/v1/genres/', {'search': 'ЖАНР 1'}).json()
+        assert data['results'][0]['slug'] == 'genre-1'
+
+    @pytest.mark.skipif(
+        connection.vendor == 'postgresql',
+        reason='Индекс в памяти используется только без PostgreSQL')
+    def test_memory_index_only_in_tests(self, client, named_titles, settings):
+        settings.SEARCH_MEMORY_INDEX = False
+        data = client.get('/api/v1/titles/', {'search': 'властилин'}).json()
+        assert data['results'] == [], (
+            'Проверьте, что без SEARCH_MEMORY_INDEX индекс в памяти '
+            'не строится'
+        )
@@ -0,0 +1,141 @@
+import pytest
+
+
+@pytest.mark.django_db
+class TestAuthThrottling:
+
+    def signup(self, client, username='newuser', email=None, ip='10.0.0.1'):
+        return client.post('/api/v1/auth/signup/', {
+            'username': username,
+            'email': email or f'{username}@yamdb.fake',
+        }, REMOTE_ADDR=ip)
+
+    def test_signup_limited_by_ip(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'signup_ip': '3/min'},
+        }
+        for i in range(3):
+            assert self.signup(client, f'newuser{i}').status_code == 200
+        response = self.signup(client, 'newuser3')
+        assert response.status_code == 429, (
+            'Проверьте, что signup ограничен по IP'
+        )
+        assert 'Retry-After' in response
+        assert self.signup(client, 'newuser3', ip='10.0.0.2').status_code == 200
+
+    def test_spoofed_forwarded_for_keeps_bucket(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'signup_ip': '2/min'},
+        }
+        statuses = [
+            client.post('/api/v1/auth/signup/', {
+                'username': f'newuser{i}', 'email': f'newuser{i}@yamdb.fake',
+            }, REMOTE_ADDR='172.18.0.5',
+                HTTP_X_FORWARDED_FOR=f'1.2.3.{i}, 10.0.0.1').status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 429], (
+            'Проверьте, что IP берется из адреса, добавленного nginx, '
+            'а подделанный X-Forwarded-For не меняет счетчик'
+        )
+        response = client.post('/api/v1/auth/signup/', {
+            'username': 'other', 'email': 'other@yamdb.fake',
+        }, REMOTE_ADDR='172.18.0.5', HTTP_X_FORWARDED_FOR='10.0.0.2')
+        assert response.status_code == 200, (
+            'Проверьте, что клиенты за nginx не делят один счетчик'
+        )
+
+    def test_signup_limited_by_email(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'signup_email': '2/hour'},
+        }
+        for i in range(2):
+            self.signup(client, ip=f'10.0.0.{i}')
+        response = self.signup(client, email='NEWUSER@yamdb.fake', ip='10.1.1.1')
+        assert response.status_code == 429, (
+            'Проверьте, что signup ограничен по email с любого IP'
+        )
+
+    def test_token_limited_by_username(self, client, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {'token_username': '2/min'},
+        }
+        self.signup(client)
+        data = {'username': 'newuser', 'confirmation_code': 'wrong'}
+        for _ in range(2):
+            response = client.post('/api/v1/auth/token/', data)
+            assert response.status_code == 400
+        response = client.post('/api/v1/auth/token/', data)
+        assert response.status_code == 429, (
+            'Проверьте, что подбор кода ограничен по username'
+        )
+
+    @pytest.mark.parametrize('url', ['/api/v1/auth/signup/',
+                                     '/api/v1/auth/token/'])
+    @pytest.mark.parametrize('body', ['[]', '[1]', '"text"'])
+    def test_not_an_object_body(self, client, settings, url, body):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {
+                'signup_email': '2/hour', 'token_username': '2/min'},
+        }
+        response = client.post(url, body, content_type='application/json')
+        assert response.status_code == 400, (
+            'Проверьте, что тело не JSON объектом отклоняется с 400'
+        )
+
+    def test_duplicate_email_suppressed(self, client):
+        from users.models import OutgoingEmail
+
+        for _ in range(3):
+            assert self.signup(client).status_code == 200
+        assert OutgoingEmail.objects.count() == 1, (
+            'Проверьте, что повторное письмо не ставится в очередь '
+            'в течение SIGNUP_EMAIL_COOLDOWN'
+        )
+
+
+@pytest.mark.parametrize(
+    'path', ['api.throttling.MemoryCounterStore',
+             'api.throttling.CacheCounterStore'])
+def test_sliding_window(path):
+    from api.throttling import get_counter_store, sliding_window_allow
+
+    store = get_counter_store(path)
+    key = f'test:{path}'
+    start = 6000.0
+    assert all(
+        sliding_window_allow(store, key, 4, 60, start + i) for i in range(4))
+    assert not sliding_window_allow(store, key, 4, 60, start + 30)
+    # Через полминуты после начала нового окна прошлое учитывается
+    # наполовину: 4 * 0.5 = 2, осталось место для двух запросов.
+    assert sliding_window_allow(store, key, 4, 60, start + 90)
+    assert sliding_window_allow(store, key, 4, 60, start + 90)
+    assert not sliding_window_allow(store, key, 4, 60, start + 90)
+
+
+def test_sliding_window_concurrent():
+    import threading
+
+    from api.throttling import MemoryCounterStore, sliding_window_allow
+
+    store = MemoryCounterStore()
+    barrier = threading.Barrier(20)
+    results = []
+
+    def hit():
+        barrier.wait()
+        results.append(sliding_window_allow(store, 'burst', 5, 60, 6000.0))
+
+    threads = [threading.Thread(target=hit) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results.count(True) == 5, (
+        'Проверьте, что одновременные запросы не проходят сверх лимита'
+    )
@@ -0,0 +1,62 @@
+import json
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def timing(settings):
+    from api.middleware import reset_route_stats
+
+    settings.QUERY_TIMING_SAMPLE_RATE = 1
+    reset_route_stats()
+    yield
+    reset_route_stats()
+
+
+@pytest.mark.django_db
+class TestQueryTiming:
+
+    def test_server_timing_header(self, timing, user_client, titles):
+        response = user_client.get('/api/v1/titles/')
+        assert response.status_code == 200
+        header = response['Server-Timing']
+        for metric in ('db;dur=', 'view;dur=', 'render;dur=', 'total;dur='):
+            assert metric in header, (
+                f'Проверьте, что Server-Timing содержит {metric}'
+            )
+        assert 'queries"' in header
+
+    def test_log_line(self, timing, user_client, titles, caplog):
+        with caplog.at_level(logging.INFO, logger='api.timing'):
+            user_client.get(f'/api/v1/titles/{titles[0].id}/')
+        record = json.loads(caplog.records[-1].getMessage())
+        assert record['route'] == 'titles-detail'
+        assert record['status'] == 200
+        assert record['queries'] > 0
+        assert record['slowest_query'].startswith('SELECT')
+        assert record['total_ms'] >= record['db_ms']
+
+    def test_sampling_disabled(self, settings, user_client, titles):
+        settings.QUERY_TIMING_SAMPLE_RATE = 0
+        response = user_client.get('/api/v1/titles/')
+        assert 'Server-Timing' not in response
+
+    def test_debug_endpoint(self, timing, settings, user_client, client,
+                            titles):
+        response = client.get('/api/v1/debug/timing/')
+        assert response.status_code == 404, (
+            'Проверьте, что статистика недоступна без DEBUG'
+        )
+        settings.DEBUG = True
+        for _ in range(3):
+            user_client.get('/api/v1/titles/')
+        user_client.get('/api/v1/genres/')
+        stats = {
+            row['route']: row
+            for row in client.get('/api/v1/debug/timing/').json()
+        }
+        assert stats['titles-list']['requests'] == 3
+        assert stats['titles-list']['avg_queries'] > 0
+        assert 'genres-list' in stats
+        assert client.delete('/api/v1/debug/timing/').status_code == 204
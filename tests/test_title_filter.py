@@ -0,0 +1,72 @@
+import pytest
+from django.db import connection
+
+
+@pytest.mark.django_db
+class TestTitleFilter:
+
+    def test_genre_and_category(self, client, titles, genres, categories):
+        data = client.get('/api/v1/titles/', {
+            'genre': genres[1].slug, 'category': categories[1].slug,
+        }).json()
+        expected = {
+            title.id for title in titles
+            if genres[1] in title.genre.all()
+            and title.category == categories[1]
+        }
+        ids = [title['id'] for title in data['results']]
+        assert len(ids) == len(set(ids)), 'Проверьте, что нет дублей'
+        assert set(ids) == expected
+
+    def test_unknown_slug(self, client, titles):
+        data = client.get('/api/v1/titles/', {'genre': 'unknown'}).json()
+        assert data['count'] == 0
+
+    def test_slug_not_cached_without_shared_cache(self, client, titles,
+                                                  settings):
+        from reviews.models import Genre
+
+        settings.CACHE_SHARED = False
+        assert client.get(
+            '/api/v1/titles/', {'genre': 'late'}).json()['count'] == 0
+        genre = Genre.objects.create(name='Поздний', slug='late')
+        titles[0].genre.add(genre)
+        assert client.get(
+            '/api/v1/titles/', {'genre': 'late'}).json()['count'] == 1, (
+            'Проверьте, что без общего кеша slug не кешируется'
+        )
+
+    def test_genre_title_is_unique(self, titles, genres):
+        from django.db import IntegrityError, transaction
+        from reviews.models import GenreTitle
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            GenreTitle.objects.create(title=titles[0], genre=genres[0])
+
+
+@pytest.mark.django_db
+@pytest.mark.skipif(connection.vendor != 'postgresql',
+                    reason='EXPLAIN проверяется только на PostgreSQL')
+class TestTitleFilterPlan:
+
+    def explain(self, queryset):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        return queryset.explain()
+
+    def test_genre_filter_uses_index(self, titles, genres):
+        from api.filters import TitleFilter
+        from reviews.models import Title
+
+        queryset = TitleFilter(
+            {'genre': genres[0].slug}, queryset=Title.objects.all()).qs
+        assert 'genretitle_genre_title_idx' in self.explain(queryset)
+
+    def test_category_year_uses_index(self, titles, categories):
+        from api.filters import TitleFilter
+        from reviews.models import Title
+
+        queryset = TitleFilter(
+            {'category': categories[0].slug, 'year': 1995},
+            queryset=Title.objects.all()).qs
+        assert 'title_category_year_idx' in self.explain(queryset)